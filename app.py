@@ -1,9 +1,21 @@
-import math
+import os
+import time
 
-import pandas as pd
+import numpy as np
 import streamlit as st
-
-import matplotlib.pyplot as plt
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from armazem import MAX_PONTOS_GRAFICO, ArmazemDatasets, previa
+from cenarios import consultar
+from dataset import estimar_lambdas
+from filas import curva_metricas, grade_lambda, mm1_metrics, mmc_metrics
+from graficos import (
+    grafico_cenarios,
+    grafico_comparativo,
+    grafico_curva_w,
+    grafico_metricas,
+    grafico_volume,
+)
 
 
 # ----------------------------------------
@@ -153,91 +165,16 @@ st.markdown(
 st.caption("Projeto de Modelagem: Teoria das Filas aplicada a um sistema web de alta demanda.")
 
 
-# ----------------------------------------
-# Funções de métricas de fila
-# ----------------------------------------
-def mm1_metrics(lmbda: float, mu: float):
-    """
-    Calcula métricas do modelo M/M/1.
-    λ (lmbda) e μ (mu) em requisições por segundo.
-    Retorna dict ou None se o sistema for instável.
-    """
-    if lmbda <= 0 or mu <= 0:
-        return None
-
-    if lmbda >= mu:
-        # Sistema instável (ρ >= 1)
-        return None
-
-    rho = lmbda / mu  # Utilização
-    L = rho / (1 - rho)  # Número médio no sistema
-    Lq = (rho ** 2) / (1 - rho)  # Número médio na fila
-    W = 1 / (mu - lmbda)  # Tempo médio no sistema (s)
-    Wq = lmbda / (mu * (mu - lmbda))  # Tempo médio na fila (s)
-
-    return {
-        "rho": rho,
-        "L": L,
-        "Lq": Lq,
-        "W": W,
-        "Wq": Wq,
-    }
-
-
-def mmc_metrics(lmbda: float, mu: float, c: int):
-    """
-    Calcula métricas do modelo M/M/c (c servidores idênticos).
-    Fórmulas clássicas com Erlang C.
-    λ e μ em req/s.
-
-    Retorna dict ou None se sistema for instável ou parâmetros inválidos.
-    """
-    if lmbda <= 0 or mu <= 0 or c <= 0:
-        return None
-
-    # taxa de utilização global
-    rho = lmbda / (c * mu)
-    if rho >= 1:
-        # sistema instável
-        return None
-
-    a = lmbda / mu  # tráfego oferecido
-
-    # cálculo de P0 (probabilidade de zero clientes no sistema)
-    sum_terms = 0.0
-    for n in range(c):
-        sum_terms += (a ** n) / math.factorial(n)
-
-    last_term = (a ** c) / (math.factorial(c) * (1 - rho))
-    P0 = 1.0 / (sum_terms + last_term)
-
-    # Lq (clientes médios em fila) - fórmula de Erlang C
-    Lq = (
-        P0
-        * (a ** c)
-        * rho
-        / (math.factorial(c) * ((1 - rho) ** 2))
-    )
-
-    L = Lq + a            # clientes médios no sistema
-    Wq = Lq / lmbda       # tempo médio em fila
-    W = Wq + 1 / mu       # tempo médio no sistema
-
-    return {
-        "rho": rho,
-        "L": L,
-        "Lq": Lq,
-        "W": W,
-        "Wq": Wq,
-        "P0": P0,
-    }
-
-
 # ----------------------------------------
 # Abas do site
 # ----------------------------------------
-aba_instrucoes, aba_medicoes, aba_upload = st.tabs(
-    ["📘 Instruções", "📏 Medições Teóricas (M/M/1 e M/M/c)", "📂 Upload do Dataset"]
+aba_instrucoes, aba_medicoes, aba_upload, aba_cenarios = st.tabs(
+    [
+        "📘 Instruções",
+        "📏 Medições Teóricas (M/M/1 e M/M/c)",
+        "📂 Upload do Dataset",
+        "🗂️ Cenários Salvos",
+    ]
 )
 
 
@@ -252,7 +189,7 @@ with aba_instrucoes:
         Este site foi desenvolvido como parte de um projeto de **modelagem e avaliação de desempenho**,
         aplicando **Teoria das Filas** a um cenário inspirado no site **CoinMarketCap**.
 
-        Ele está dividido em três partes principais:
+        Ele está dividido em quatro partes principais:
 
         ### 1. Instruções
         - Apresenta o objetivo geral do projeto.
@@ -272,6 +209,8 @@ with aba_instrucoes:
           - Número médio na fila **Lq**
           - Tempo médio no sistema **W**
           - Tempo médio na fila **Wq**
+        - No **modo interativo**, sliders de λ, μ e c atualizam os cartões e a curva W × λ
+          em tempo real, sem o botão de calcular.
 
         ### 3. Upload do Dataset
         - Permite enviar um arquivo **CSV**;
@@ -279,6 +218,11 @@ with aba_instrucoes:
           - Estima um **λ médio** e um **λ de pico**;
           - Calcula as métricas de desempenho usando M/M/1 ou M/M/c.
 
+        ### 4. Cenários Salvos
+        - Mostra resultados de milhares de cenários calculados em lote
+          (`python cenarios.py cenarios_exemplo.json`), sem recalcular nada;
+        - Permite filtrar por modelo e origem de λ e comparar as métricas em gráfico.
+
         ---
         **Observação:**  
         Este é um protótipo acadêmico, focado em **conceitos de modelagem e análise de desempenho**, 
@@ -294,6 +238,101 @@ with aba_instrucoes:
 # ----------------------------------------
 # ABA 2 – MEDIÇÕES TEÓRICAS (M/M/1 e M/M/c)
 # ----------------------------------------
+# Pontos da curva pré-calculada, de ρ = 0 até logo abaixo de ρ = 1 (λ = c·μ)
+PONTOS_CURVA_INTERATIVA = 1000
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def curva_interativa(model_type: str, mu: float, c: int):
+    """
+    Métricas em toda a região estável (grade relativa a c·μ), com μ e c fixos.
+    Só é recalculada quando μ, c ou o modelo mudam.
+    Retorna (vetor de λ, passo da grade, dict de métricas).
+    """
+    lambdas, passo = grade_lambda(mu, c, PONTOS_CURVA_INTERATIVA)
+    return lambdas, passo, curva_metricas(model_type, lambdas, mu, c)
+
+
+@st.fragment
+def painel_interativo(model_type: str):
+    """
+    Sliders de λ, μ e c com cartões e curva W × λ atualizados a cada movimento.
+    Como fragmento, só este trecho é reexecutado: o resto da página (inclusive
+    a aba de dataset) não roda de novo quando um slider se move.
+
+    O slider de λ usa a própria grade da curva (0 < λ < c·μ), então mover λ é
+    uma leitura no vetor. Quando μ ou c mudam, a faixa do slider muda junto e
+    λ é reposicionado mantendo a mesma utilização ρ.
+    """
+    col1, col2, col3 = st.columns(3)
+
+    with col2:
+        mu = st.slider(
+            "Taxa de serviço μ (req/s) por servidor",
+            min_value=0.5,
+            max_value=500.0,
+            value=50.0,
+            step=0.5,
+            key="mu_interativo",
+        )
+
+    if model_type == "M/M/c":
+        with col3:
+            c = st.slider(
+                "Número de servidores c",
+                min_value=1,
+                max_value=100,
+                value=2,
+                key="c_interativo",
+            )
+    else:
+        c = 1
+
+    inicio = time.perf_counter()
+    lambdas, passo, curva = curva_interativa(model_type, mu, c)
+
+    # uma key por grade: o widget só é recriado quando a faixa (c·μ) muda, e
+    # nesse caso começa na última ρ (sem value=, que mudaria a identidade a cada movimento)
+    chave_lambda = f"lambda_interativo_{model_type}_{mu}_{c}"
+    if chave_lambda not in st.session_state:
+        rho_anterior = st.session_state.get("rho_interativo", 0.6)
+        indice_inicial = min(max(round(rho_anterior * PONTOS_CURVA_INTERATIVA), 1), len(lambdas) - 1)
+        st.session_state[chave_lambda] = float(lambdas[indice_inicial])
+
+    with col1:
+        lmbda = st.slider(
+            "Taxa de chegada λ (req/s)",
+            min_value=float(lambdas[1]),
+            max_value=float(lambdas[-1]),
+            step=passo,
+            help=f"De 0 até c·μ = {c * mu:g} req/s (região estável).",
+            key=chave_lambda,
+        )
+
+    indice = min(max(int(round(lmbda / passo)), 1), len(lambdas) - 1)
+    st.session_state["rho_interativo"] = indice / PONTOS_CURVA_INTERATIVA
+    resultados = {chave: float(valores[indice]) for chave, valores in curva.items()}
+    duracao_ms = (time.perf_counter() - inicio) * 1e3
+
+    col_a, col_b, col_c2 = st.columns(3)
+    with col_a:
+        st.metric("Utilização ρ", f"{resultados['rho']:.3f}")
+        st.metric("Nº médio no sistema L", f"{resultados['L']:.3f}")
+    with col_b:
+        st.metric("Nº médio na fila Lq", f"{resultados['Lq']:.3f}")
+    with col_c2:
+        st.metric("Tempo médio no sistema W (s)", f"{resultados['W']:.3f}")
+        st.metric("Tempo médio na fila Wq (s)", f"{resultados['Wq']:.3f}")
+
+    st.vega_lite_chart(
+        grafico_curva_w(lambdas, curva["W"], [("λ atual", float(lambdas[indice]), resultados["W"])])
+    )
+    st.caption(
+        f"Consulta em {duracao_ms:.2f} ms · curva com {len(lambdas)} pontos pré-calculada "
+        f"para μ = {mu:g} e c = {c} (mover λ é apenas uma leitura no vetor)."
+    )
+
+
 with aba_medicoes:
     st.header("Medições Teóricas – Modelos M/M/1 e M/M/c")
 
@@ -317,109 +356,208 @@ with aba_medicoes:
         horizontal=True,
     )
 
-    col1, col2, col3 = st.columns(3)
+    modo_interativo = st.toggle(
+        "Modo interativo (sliders com atualização em tempo real)",
+        help="Os cartões e a curva W × λ acompanham os sliders, sem botão de calcular.",
+    )
 
-    with col1:
-        lmbda = st.number_input(
-            "Taxa de chegada λ (req/s)",
-            min_value=0.0,
-            value=30.0,
-            step=1.0,
-            help="Quantidade média de requisições que chegam ao sistema a cada segundo."
-        )
+    if modo_interativo:
+        painel_interativo(model_type)
+    else:
+        col1, col2, col3 = st.columns(3)
 
-    with col2:
-        mu = st.number_input(
-            "Taxa de serviço μ (req/s) por servidor",
-            min_value=0.0,
-            value=50.0,
-            step=1.0,
-            help="Quantidade média de requisições que cada servidor consegue atender por segundo."
-        )
+        with col1:
+            lmbda = st.number_input(
+                "Taxa de chegada λ (req/s)",
+                min_value=0.0,
+                value=30.0,
+                step=1.0,
+                help="Quantidade média de requisições que chegam ao sistema a cada segundo."
+            )
 
-    if model_type == "M/M/c":
-        with col3:
-            c = st.number_input(
-                "Número de servidores c",
-                min_value=1,
-                value=2,
-                step=1,
-                help="Quantidade de servidores (ou instâncias) atendendo em paralelo.",
-                key="c_teorico",
+        with col2:
+            mu = st.number_input(
+                "Taxa de serviço μ (req/s) por servidor",
+                min_value=0.0,
+                value=50.0,
+                step=1.0,
+                help="Quantidade média de requisições que cada servidor consegue atender por segundo."
             )
-    else:
-        c = 1  # apenas para manter referência, não usado em M/M/1
 
-    if st.button("Calcular métricas do modelo selecionado", type="primary"):
-        if model_type == "M/M/1":
-            resultados = mm1_metrics(lmbda, mu)
+        if model_type == "M/M/c":
+            with col3:
+                c = st.number_input(
+                    "Número de servidores c",
+                    min_value=1,
+                    value=2,
+                    step=1,
+                    help="Quantidade de servidores (ou instâncias) atendendo em paralelo.",
+                    key="c_teorico",
+                )
         else:
-            resultados = mmc_metrics(lmbda, mu, c)
+            c = 1  # apenas para manter referência, não usado em M/M/1
 
-        if resultados is None:
-            st.error(
-                "Não foi possível calcular as métricas. "
-                "Verifique se λ > 0, μ > 0 e que o sistema é estável (λ < μ para M/M/1 ou λ < c·μ para M/M/c)."
-            )
-        else:
-            rho = resultados["rho"]
-            L = resultados["L"]
-            Lq = resultados["Lq"]
-            W = resultados["W"]
-            Wq = resultados["Wq"]
-
-            st.subheader("Resultados")
-
-            col_a, col_b, col_c2 = st.columns(3)
-            with col_a:
-                st.metric("Utilização ρ", f"{rho:.3f}")
-                st.metric("Nº médio no sistema L", f"{L:.3f}")
-            with col_b:
-                st.metric("Nº médio na fila Lq", f"{Lq:.3f}")
-            with col_c2:
-                st.metric("Tempo médio no sistema W (s)", f"{W:.3f}")
-                st.metric("Tempo médio na fila Wq (s)", f"{Wq:.3f}")
-
-            if model_type == "M/M/c":
-                st.markdown(
-                    f"**Modelo M/M/c com c = {c} servidores.** "
-                    "A utilização ρ representa a fração média de ocupação global do sistema."
+        if st.button("Calcular métricas do modelo selecionado", type="primary"):
+            if model_type == "M/M/1":
+                resultados = mm1_metrics(lmbda, mu)
+            else:
+                resultados = mmc_metrics(lmbda, mu, c)
+
+            if resultados is None:
+                st.error(
+                    "Não foi possível calcular as métricas. "
+                    "Verifique se λ > 0, μ > 0 e que o sistema é estável (λ < μ para M/M/1 ou λ < c·μ para M/M/c)."
                 )
             else:
-                st.markdown("**Modelo M/M/1** (um servidor lógico atendendo todas as requisições).")
-
-            st.markdown(
-                """
-                **Interpretação rápida:**
-                - Quanto mais próximo de 1 for ρ, maior o risco de saturação do sistema;
-                - L e Lq indicam o número médio de requisições em atendimento + fila;
-                - W e Wq indicam, em segundos, o tempo médio gasto no sistema e na fila.
-                """
-            )
+                rho = resultados["rho"]
+                L = resultados["L"]
+                Lq = resultados["Lq"]
+                W = resultados["W"]
+                Wq = resultados["Wq"]
+
+                st.subheader("Resultados")
+
+                col_a, col_b, col_c2 = st.columns(3)
+                with col_a:
+                    st.metric("Utilização ρ", f"{rho:.3f}")
+                    st.metric("Nº médio no sistema L", f"{L:.3f}")
+                with col_b:
+                    st.metric("Nº médio na fila Lq", f"{Lq:.3f}")
+                with col_c2:
+                    st.metric("Tempo médio no sistema W (s)", f"{W:.3f}")
+                    st.metric("Tempo médio na fila Wq (s)", f"{Wq:.3f}")
+
+                if model_type == "M/M/c":
+                    st.markdown(
+                        f"**Modelo M/M/c com c = {c} servidores.** "
+                        "A utilização ρ representa a fração média de ocupação global do sistema."
+                    )
+                else:
+                    st.markdown("**Modelo M/M/1** (um servidor lógico atendendo todas as requisições).")
 
+                st.markdown(
+                    """
+                    **Interpretação rápida:**
+                    - Quanto mais próximo de 1 for ρ, maior o risco de saturação do sistema;
+                    - L e Lq indicam o número médio de requisições em atendimento + fila;
+                    - W e Wq indicam, em segundos, o tempo médio gasto no sistema e na fila.
+                    """
+                )
 
-# ---------------- GRÁFICO (TEÓRICO) ----------------
-            st.subheader("Gráfico das métricas")
 
-            metricas = {
-                "ρ (utilização)": rho,
-                "L (no sistema)": L,
-                "Lq (na fila)": Lq,
-                "W (tempo no sistema)": W,
-                "Wq (tempo na fila)": Wq,
-            }
+    # ---------------- GRÁFICO (TEÓRICO) ----------------
+                st.subheader("Gráfico das métricas")
 
-            fig, ax = plt.subplots(figsize=(8, 4))
-            ax.bar(list(metricas.keys()), list(metricas.values()))
-            ax.set_ylabel("Valor")
-            ax.set_title(f"Métricas do modelo {model_type}")
-            plt.xticks(rotation=45)
-            st.pyplot(fig)
+                metricas = {
+                    "ρ (utilização)": rho,
+                    "L (no sistema)": L,
+                    "Lq (na fila)": Lq,
+                    "W (tempo no sistema)": W,
+                    "Wq (tempo na fila)": Wq,
+                }
+
+                st.pyplot(grafico_metricas(metricas, model_type))
 
 
 # ----------------------------------------
 # ABA 3 – UPLOAD DO DATASET
 # ----------------------------------------
+@st.cache_resource
+def obter_armazem():
+    """
+    Armazém único por processo: sessões que enviam o mesmo CSV compartilham
+    a mesma tabela Arrow mapeada em memória.
+    """
+    return ArmazemDatasets()
+
+
+def descartar_envio(arquivo):
+    """
+    Apaga do servidor os bytes do CSV enviado por esta sessão (como o próprio
+    Streamlit faz no st.chat_input). Depois que o conteúdo está no armazém, a
+    sessão só precisa da ReferenciaDataset; sem isso cada sessão manteria uma
+    cópia completa do arquivo até o fim.
+    """
+    ctx = get_script_run_ctx()
+    remover = getattr(ctx.uploaded_file_mgr, "remove_file", None) if ctx else None
+    if remover is not None and getattr(arquivo, "file_id", None):
+        remover(session_id=ctx.session_id, file_id=arquivo.file_id)
+
+
+@st.fragment
+def painel_interativo_dataset(model_type_ds: str, lambda_medio: float, lambda_pico: float, mu_padrao: float):
+    """
+    Sliders de μ e c para o dataset, com λ médio e λ pico já estimados (vindos
+    do armazém compartilhado). Como fragmento, mover um slider não reexecuta a
+    leitura do dataset nem o resto da página.
+    """
+    col_par1, col_par2 = st.columns(2)
+
+    with col_par1:
+        # sem key: a faixa depende do dataset, e o widget é recriado quando ele muda
+        mu = st.slider(
+            "Taxa de serviço μ (req/s) por servidor",
+            min_value=mu_padrao / 10,
+            max_value=mu_padrao * 10,
+            value=mu_padrao,
+            step=mu_padrao / 100,
+            help="Capacidade média de atendimento de cada servidor (req/s).",
+        )
+
+    if model_type_ds == "M/M/c":
+        with col_par2:
+            c = st.slider(
+                "Número de servidores c",
+                min_value=1,
+                max_value=100,
+                value=2,
+                key="c_interativo_ds",
+            )
+    else:
+        c = 1
+
+    inicio = time.perf_counter()
+    lambdas, _, curva = curva_interativa(model_type_ds, mu, c)
+    if model_type_ds == "M/M/1":
+        res_medio = mm1_metrics(lambda_medio, mu)
+        res_pico = mm1_metrics(lambda_pico, mu)
+    else:
+        res_medio = mmc_metrics(lambda_medio, mu, c)
+        res_pico = mmc_metrics(lambda_pico, mu, c)
+    duracao_ms = (time.perf_counter() - inicio) * 1e3
+
+    if res_medio is None or res_pico is None:
+        st.error(
+            "Não foi possível calcular as métricas. "
+            "Verifique se μ é maior do que λ médio e λ pico (para M/M/1) "
+            "ou se λ < c·μ (para M/M/c), garantindo estabilidade do sistema."
+        )
+        return
+
+    for titulo, sufixo, res in (("Dia Médio", "médio", res_medio), ("Dia de Pico", "pico", res_pico)):
+        st.subheader(f"Resultados - {titulo}")
+        col_r1, col_r2, col_r3 = st.columns(3)
+        with col_r1:
+            st.metric(f"ρ {sufixo}", f"{res['rho']:.4f}")
+            st.metric(f"L {sufixo}", f"{res['L']:.4f}")
+        with col_r2:
+            st.metric(f"Lq {sufixo}", f"{res['Lq']:.4f}")
+        with col_r3:
+            st.metric(f"W {sufixo} (s)", f"{res['W']:.4f}")
+            st.metric(f"Wq {sufixo} (s)", f"{res['Wq']:.4f}")
+
+    st.vega_lite_chart(
+        grafico_curva_w(
+            lambdas,
+            curva["W"],
+            [("λ médio", lambda_medio, res_medio["W"]), ("λ pico", lambda_pico, res_pico["W"])],
+        )
+    )
+    st.caption(
+        f"Atualizado em {duracao_ms:.2f} ms · curva W × λ pré-calculada para μ = {mu:g} e c = {c}."
+    )
+
+
 with aba_upload:
     st.header("Upload do Dataset (CoinMarketCap / outro CSV)")
 
@@ -433,23 +571,51 @@ with aba_upload:
         """
     )
 
+    # a key muda a cada envio aceito: o uploader volta vazio e não guarda o arquivo
+    numero_envio = st.session_state.setdefault("numero_envio_csv", 0)
     arquivo = st.file_uploader(
         "Envie o arquivo CSV com volume diário agregado",
         type=["csv"],
-        help="Use, por exemplo, o arquivo historical_daily_volume_reduzido.csv com colunas 'date' e 'volume_24h_total'."
+        help="Use, por exemplo, o arquivo historical_daily_volume_reduzido.csv com colunas 'date' e 'volume_24h_total'.",
+        key=f"arquivo_csv_{numero_envio}",
     )
 
     if arquivo is not None:
+        # O conteúdo vai para o armazém compartilhado; a sessão guarda só a referência
         try:
-            df = pd.read_csv(arquivo)
+            referencia = obter_armazem().adquirir(arquivo)
         except Exception as e:
             st.error(f"Erro ao ler o CSV: {e}")
             st.stop()
 
-        st.success("CSV carregado com sucesso! Pré-visualização:")
-        st.dataframe(df.head())
+        envio_anterior = st.session_state.pop("dataset_compartilhado", None)
+        if envio_anterior is not None:
+            envio_anterior[1].liberar()
+        st.session_state["dataset_compartilhado"] = (arquivo.name, referencia)
+
+        descartar_envio(arquivo)
+        st.session_state["numero_envio_csv"] = numero_envio + 1
+        st.rerun()
+
+    if "dataset_compartilhado" in st.session_state:
+        nome_arquivo, referencia = st.session_state["dataset_compartilhado"]
+        tabela = referencia.tabela
+
+        col_status, col_descartar = st.columns([4, 1])
+        with col_status:
+            st.success(f"CSV `{nome_arquivo}` carregado com sucesso! Pré-visualização:")
+        with col_descartar:
+            if st.button("Descartar dataset", help="Libera o dataset desta sessão; um novo envio também o substitui."):
+                st.session_state.pop("dataset_compartilhado")[1].liberar()
+                st.rerun()
+        st.dataframe(previa(tabela))
+        st.caption(
+            f"Dataset compartilhado (somente leitura) por "
+            f"{obter_armazem().referencias(referencia.chave)} sessão(ões) · "
+            f"{tabela.num_rows:,} linhas · hash {referencia.chave[:12]}"
+        )
 
-        colunas = df.columns.tolist()
+        colunas = tabela.column_names
 
         st.subheader("Configurações de colunas")
 
@@ -466,23 +632,20 @@ with aba_upload:
         )
 
         if col_data != "<nenhuma>":
-            try:
-                df[col_data] = pd.to_datetime(df[col_data])
-            except Exception:
+            # série amostrada, calculada uma vez por dataset e compartilhada entre sessões
+            df_grafico, datas_convertidas = obter_armazem().serie_volume(
+                referencia, col_data, col_volume
+            )
+            if not datas_convertidas:
                 st.warning(
                     "Não foi possível converter a coluna de data automaticamente. "
                     "Verifique o formato da coluna selecionada."
                 )
 
-        # Limpeza básica de volume
-        df_limp = df.dropna(subset=[col_volume]).copy()
-        df_limp[col_volume] = pd.to_numeric(df_limp[col_volume], errors="coerce")
-        df_limp = df_limp.dropna(subset=[col_volume])
-
         st.subheader("Resumo do volume diário")
 
-        volume_medio = df_limp[col_volume].mean()
-        volume_max = df_limp[col_volume].max()
+        # Limpeza básica de volume + média/máximo na tabela compartilhada (uma vez por dataset)
+        volume_medio, volume_max = obter_armazem().resumo_volume(referencia, col_volume)
 
         st.write(f"**Volume médio por linha** (ex.: por dia): `{volume_medio:,.2f}`")
         st.write(f"**Maior volume em uma linha** (pico): `{volume_max:,.2f}`")
@@ -491,13 +654,12 @@ with aba_upload:
         # Gráfico simples do volume ao longo do tempo (se houver data)
         if col_data != "<nenhuma>":
             st.subheader("Evolução do volume diário")
-            fig_vol, ax_vol = plt.subplots(figsize=(9, 3))
-            ax_vol.plot(df_limp[col_data], df_limp[col_volume])
-            ax_vol.set_xlabel("Data")
-            ax_vol.set_ylabel("Volume diário")
-            ax_vol.set_title("Volume diário ao longo do tempo")
-            plt.xticks(rotation=30)
-            st.pyplot(fig_vol)    
+            st.pyplot(grafico_volume(df_grafico[col_data], df_grafico[col_volume]))
+            if tabela.num_rows > MAX_PONTOS_GRAFICO:
+                st.caption(
+                    f"Gráfico com amostra regular de até {MAX_PONTOS_GRAFICO:,} das "
+                    f"{tabela.num_rows:,} linhas."
+                )
 
         st.markdown("---")
 
@@ -520,9 +682,7 @@ with aba_upload:
             unsafe_allow_html=True,
         )
 
-        segundos_dia = 24 * 3600
-        lambda_medio = volume_medio / segundos_dia
-        lambda_pico = volume_max / segundos_dia
+        lambda_medio, lambda_pico = estimar_lambdas(volume_medio, volume_max)
 
         col_l1, col_l2 = st.columns(2)
         with col_l1:
@@ -540,130 +700,198 @@ with aba_upload:
             horizontal=True,
         )
 
-        col_par1, col_par2 = st.columns(2)
+        modo_interativo_ds = st.toggle(
+            "Modo interativo (sliders com atualização em tempo real)",
+            help="Os cartões do dia médio e do dia de pico acompanham os sliders de μ e c.",
+            key="modo_interativo_ds",
+        )
 
-        with col_par1:
-            mu_dataset = st.number_input(
-                "Taxa de serviço μ (req/s) por servidor",
-                min_value=0.0,
-                value=float(max(lambda_pico * 2, 1.0)),
-                step=1.0,
-                help="Capacidade média de atendimento de cada servidor (req/s)."
+        if modo_interativo_ds:
+            painel_interativo_dataset(
+                model_type_ds, lambda_medio, lambda_pico, float(max(lambda_pico * 2, 1.0))
             )
-
-        if model_type_ds == "M/M/c":
-            with col_par2:
-                c_dataset = st.number_input(
-                    "Número de servidores c",
-                    min_value=1,
-                    value=2,
-                    step=1,
-                    help="Quantidade de servidores (ou instâncias) atendendo em paralelo para análise do dataset.",
-                    key="c_dataset",
-                )
         else:
-            c_dataset = 1
+            col_par1, col_par2 = st.columns(2)
+
+            with col_par1:
+                mu_dataset = st.number_input(
+                    "Taxa de serviço μ (req/s) por servidor",
+                    min_value=0.0,
+                    value=float(max(lambda_pico * 2, 1.0)),
+                    step=1.0,
+                    help="Capacidade média de atendimento de cada servidor (req/s)."
+                )
 
-        if st.button("Calcular métricas com base no dataset", type="primary"):
-            if model_type_ds == "M/M/1":
-                res_medio = mm1_metrics(lambda_medio, mu_dataset)
-                res_pico = mm1_metrics(lambda_pico, mu_dataset)
+            if model_type_ds == "M/M/c":
+                with col_par2:
+                    c_dataset = st.number_input(
+                        "Número de servidores c",
+                        min_value=1,
+                        value=2,
+                        step=1,
+                        help="Quantidade de servidores (ou instâncias) atendendo em paralelo para análise do dataset.",
+                        key="c_dataset",
+                    )
             else:
-                res_medio = mmc_metrics(lambda_medio, mu_dataset, c_dataset)
-                res_pico = mmc_metrics(lambda_pico, mu_dataset, c_dataset)
+                c_dataset = 1
 
-            if res_medio is None or res_pico is None:
-                st.error(
-                    "Não foi possível calcular as métricas. "
-                    "Verifique se μ é maior do que λ médio e λ pico (para M/M/1) "
-                    "ou se λ < c·μ (para M/M/c), garantindo estabilidade do sistema."
-                )
-            else:
-                st.subheader("Resultados - Dia Médio")
-                colm1, colm2, colm3 = st.columns(3)
-                with colm1:
-                    st.metric("ρ médio", f"{res_medio['rho']:.4f}")
-                    st.metric("L médio", f"{res_medio['L']:.4f}")
-                with colm2:
-                    st.metric("Lq médio", f"{res_medio['Lq']:.4f}")
-                with colm3:
-                    st.metric("W médio (s)", f"{res_medio['W']:.4f}")
-                    st.metric("Wq médio (s)", f"{res_medio['Wq']:.4f}")
-
-                st.subheader("Resultados - Dia de Pico")
-                colp1, colp2, colp3 = st.columns(3)
-                with colp1:
-                    st.metric("ρ pico", f"{res_pico['rho']:.4f}")
-                    st.metric("L pico", f"{res_pico['L']:.4f}")
-                with colp2:
-                    st.metric("Lq pico", f"{res_pico['Lq']:.4f}")
-                with colp3:
-                    st.metric("W pico (s)", f"{res_pico['W']:.4f}")
-                    st.metric("Wq pico (s)", f"{res_pico['Wq']:.4f}")
-
-                if model_type_ds == "M/M/c":
-                    st.markdown(
-                        f"**Modelo M/M/c com c = {c_dataset} servidores aplicado ao dia médio e ao dia de pico.**"
+            if st.button("Calcular métricas com base no dataset", type="primary"):
+                if model_type_ds == "M/M/1":
+                    res_medio = mm1_metrics(lambda_medio, mu_dataset)
+                    res_pico = mm1_metrics(lambda_pico, mu_dataset)
+                else:
+                    res_medio = mmc_metrics(lambda_medio, mu_dataset, c_dataset)
+                    res_pico = mmc_metrics(lambda_pico, mu_dataset, c_dataset)
+
+                if res_medio is None or res_pico is None:
+                    st.error(
+                        "Não foi possível calcular as métricas. "
+                        "Verifique se μ é maior do que λ médio e λ pico (para M/M/1) "
+                        "ou se λ < c·μ (para M/M/c), garantindo estabilidade do sistema."
                     )
                 else:
-                    st.markdown("**Modelo M/M/1 aplicado ao dia médio e ao dia de pico.**")
+                    st.subheader("Resultados - Dia Médio")
+                    colm1, colm2, colm3 = st.columns(3)
+                    with colm1:
+                        st.metric("ρ médio", f"{res_medio['rho']:.4f}")
+                        st.metric("L médio", f"{res_medio['L']:.4f}")
+                    with colm2:
+                        st.metric("Lq médio", f"{res_medio['Lq']:.4f}")
+                    with colm3:
+                        st.metric("W médio (s)", f"{res_medio['W']:.4f}")
+                        st.metric("Wq médio (s)", f"{res_medio['Wq']:.4f}")
+
+                    st.subheader("Resultados - Dia de Pico")
+                    colp1, colp2, colp3 = st.columns(3)
+                    with colp1:
+                        st.metric("ρ pico", f"{res_pico['rho']:.4f}")
+                        st.metric("L pico", f"{res_pico['L']:.4f}")
+                    with colp2:
+                        st.metric("Lq pico", f"{res_pico['Lq']:.4f}")
+                    with colp3:
+                        st.metric("W pico (s)", f"{res_pico['W']:.4f}")
+                        st.metric("Wq pico (s)", f"{res_pico['Wq']:.4f}")
+
+                    if model_type_ds == "M/M/c":
+                        st.markdown(
+                            f"**Modelo M/M/c com c = {c_dataset} servidores aplicado ao dia médio e ao dia de pico.**"
+                        )
+                    else:
+                        st.markdown("**Modelo M/M/1 aplicado ao dia médio e ao dia de pico.**")
+
+      # --------- GRÁFICO COMPARATIVO (Médio x Pico) ----------
+                    st.subheader("Gráfico comparativo – Dia Médio x Dia de Pico")
+
+                    metricas_medio = {
+                        "ρ": res_medio["rho"],
+                        "L": res_medio["L"],
+                        "Lq": res_medio["Lq"],
+                        "W": res_medio["W"],
+                        "Wq": res_medio["Wq"],
+                    }
+
+                    metricas_pico = {
+                        "ρ": res_pico["rho"],
+                        "L": res_pico["L"],
+                        "Lq": res_pico["Lq"],
+                        "W": res_pico["W"],
+                        "Wq": res_pico["Wq"],
+                    }
+
+                    st.pyplot(grafico_comparativo(metricas_medio, metricas_pico))
+                   
+                    st.markdown(
+                        """
+                        **Interpretação:**
+
+                        - No **dia médio**, ρ mostra o quanto o sistema está ocupado em situação típica;
+                        - No **dia de pico**, ρ se aproxima mais de 1, indicando maior risco de saturação;
+                        - W e Wq podem ser usados para discutir impacto no tempo de resposta percebido pelos usuários;
+                        - Ao variar μ e (quando aplicável) c, você consegue simular melhorias na infraestrutura.
+                        """
+                    )
+    else:
+        st.info("Envie um arquivo CSV para habilitar as análises desta aba.")
 
-  # --------- GRÁFICO COMPARATIVO (Médio x Pico) ----------
-                st.subheader("Gráfico comparativo – Dia Médio x Dia de Pico")
 
-                metricas_medio = {
-                    "ρ": res_medio["rho"],
-                    "L": res_medio["L"],
-                    "Lq": res_medio["Lq"],
-                    "W": res_medio["W"],
-                    "Wq": res_medio["Wq"],
-                }
+# ----------------------------------------
+# ABA 4 – CENÁRIOS SALVOS (SQLite)
+# ----------------------------------------
+@st.cache_data(show_spinner=False)
+def carregar_cenarios_salvos(caminho_banco: str, modificado_em: float):
+    """
+    Lê os cenários do banco; a data de modificação entra na chave do cache
+    para que uma nova execução em lote apareça sem reiniciar o app.
+    """
+    return consultar(caminho_banco)
 
-                metricas_pico = {
-                    "ρ": res_pico["rho"],
-                    "L": res_pico["L"],
-                    "Lq": res_pico["Lq"],
-                    "W": res_pico["W"],
-                    "Wq": res_pico["Wq"],
-                }
 
-                fig2, ax2 = plt.subplots(figsize=(9, 4))
-                indices = range(len(metricas_medio))
-                larg = 0.35
+with aba_cenarios:
+    st.header("Cenários Salvos (execução em lote)")
 
-                ax2.bar(
-                    [i - larg/2 for i in indices],
-                    list(metricas_medio.values()),
-                    width=larg,
-                    label="Dia Médio",
-                )
-                ax2.bar(
-                    [i + larg/2 for i in indices],
-                    list(metricas_pico.values()),
-                    width=larg,
-                    label="Dia de Pico",
-                )
+    st.markdown(
+        """
+        Os cenários são calculados fora do app, em paralelo, a partir de um arquivo JSON
+        com as combinações de modelo, λ, μ, c e K:
 
-                ax2.set_xticks(list(indices))
-                ax2.set_xticklabels(list(metricas_medio.keys()))
-                ax2.set_ylabel("Valor")
-                ax2.set_title("Métricas – comparação Dia Médio x Dia de Pico")
-                ax2.legend()
+        ```
+        python cenarios.py cenarios_exemplo.json --banco cenarios.db
+        ```
 
-                st.pyplot(fig2)
-                   
-                st.markdown(
-                    """
-                    **Interpretação:**
+        Cenários já calculados não são refeitos. Aqui os resultados são apenas consultados.
+        """
+    )
 
-                    - No **dia médio**, ρ mostra o quanto o sistema está ocupado em situação típica;
-                    - No **dia de pico**, ρ se aproxima mais de 1, indicando maior risco de saturação;
-                    - W e Wq podem ser usados para discutir impacto no tempo de resposta percebido pelos usuários;
-                    - Ao variar μ e (quando aplicável) c, você consegue simular melhorias na infraestrutura.
-                    """
-                )
+    caminho_banco = st.text_input("Banco SQLite de resultados", value="cenarios.db")
+
+    if not os.path.exists(caminho_banco):
+        st.info("Banco não encontrado. Execute o comando acima para gerar os cenários.")
     else:
-        st.info("Envie um arquivo CSV para habilitar as análises desta aba.")
+        df_cen = carregar_cenarios_salvos(caminho_banco, os.path.getmtime(caminho_banco))
+
+        if df_cen.empty:
+            st.info("O banco ainda não possui cenários.")
+        else:
+            col_f1, col_f2 = st.columns(2)
+            with col_f1:
+                modelo_cen = st.selectbox("Modelo", sorted(df_cen["modelo"].unique()))
+            df_sel = df_cen[df_cen["modelo"] == modelo_cen]
+
+            with col_f2:
+                origem_cen = st.selectbox("Origem de λ", sorted(df_sel["origem_lambda"].unique()))
+            df_sel = df_sel[df_sel["origem_lambda"] == origem_cen]
+
+            eixos = ["lmbda", "mu"]
+            if modelo_cen in ("M/M/c", "M/M/c/K"):
+                eixos.append("c")
+            if modelo_cen.endswith("/K"):
+                eixos.append("K")
+            metricas_cen = ["W", "Wq", "L", "Lq", "rho", "P0"]
+            if modelo_cen.endswith("/K"):
+                metricas_cen.append("PK")
+
+            col_f3, col_f4 = st.columns(2)
+            with col_f3:
+                eixo_x = st.selectbox("Eixo X", eixos)
+            with col_f4:
+                metrica_cen = st.selectbox("Métrica", metricas_cen)
+
+            estaveis = df_sel[df_sel["estavel"] == 1]
+            st.caption(
+                f"{len(df_sel)} cenário(s) no filtro, {len(df_sel) - len(estaveis)} instável(is) "
+                "(ficam fora do gráfico)."
+            )
+
+            if estaveis.empty:
+                st.warning("Nenhum cenário estável para este filtro.")
+            else:
+                st.pyplot(grafico_cenarios(estaveis, eixo_x, metrica_cen))
+
+            st.dataframe(
+                df_sel[
+                    ["modelo", "lmbda", "mu", "c", "K", "estavel"] + metricas_cen + ["calculado_em"]
+                ]
+            )
 
 
 
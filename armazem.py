@@ -0,0 +1,313 @@
+"""
+Armazém de datasets compartilhado entre sessões do Streamlit.
+
+Cada CSV enviado é identificado pelo hash do conteúdo, convertido uma única
+vez para um arquivo Arrow IPC em disco e aberto por memory-map. Todas as
+sessões que enviam o mesmo arquivo recebem a mesma tabela (somente leitura),
+cujos buffers são páginas do arquivo mapeado: o sistema operacional mantém
+uma única cópia na memória, independentemente do número de usuários.
+
+Resultados derivados de uma coluna (média/máximo, série do gráfico) também
+são calculados uma única vez por dataset e compartilhados entre as sessões.
+
+As sessões seguram uma ReferenciaDataset; quando a última referência a um
+hash é liberada (explicitamente ou quando a sessão é descartada), o
+mapeamento e os derivados saem do registro. Liberações vindas do coletor de
+lixo só entram numa fila e são processadas na próxima chamada ao armazém:
+o finalizador pode rodar em qualquer ponto de qualquer thread, inclusive
+numa que já segura a trava do armazém. O arquivo .arrow continua em
+disco como cache, para ser reaberto sem novo parsing, mas o diretório tem
+limite de tamanho: ao passar do limite, os arquivos sem uso há mais tempo
+são apagados (arquivos em uso neste processo nunca são apagados).
+"""
+import collections
+import glob
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import weakref
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from dataset import converter_datas, ler_csv, limpar_volume
+
+
+DIRETORIO_PADRAO = os.path.join(tempfile.gettempdir(), "filas_coinmarketcap_datasets")
+
+TAMANHO_BLOCO_HASH = 8 * 1024 * 1024
+
+# Tamanho máximo dos .arrow sem uso mantidos em disco como cache
+LIMITE_DISCO_PADRAO = 10 * 1024 ** 3
+
+# Temporários de escrita mais antigos que isso são sobras de processos interrompidos
+IDADE_MAXIMA_TEMPORARIO_S = 3600
+
+# Pontos da série do gráfico de volume (amostra regular das linhas)
+MAX_PONTOS_GRAFICO = 5000
+
+
+def hash_conteudo(arquivo) -> str:
+    """
+    SHA-256 do conteúdo de um arquivo aberto em modo binário (ou do
+    UploadedFile do Streamlit), lido em blocos. A posição volta ao início.
+    """
+    sha = hashlib.sha256()
+    arquivo.seek(0)
+    for bloco in iter(lambda: arquivo.read(TAMANHO_BLOCO_HASH), b""):
+        sha.update(bloco)
+    arquivo.seek(0)
+    return sha.hexdigest()
+
+
+def _para_arrow(df: pd.DataFrame) -> pa.Table:
+    """
+    Converte o DataFrame lido do CSV em tabela Arrow. Colunas de texto com
+    tipos misturados, que o Arrow não aceita, viram texto.
+    """
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        objetos = df.select_dtypes(include="object").columns
+        return pa.Table.from_pandas(df.astype({c: "string" for c in objetos}), preserve_index=False)
+
+
+class _Entrada:
+    def __init__(self):
+        self.trava = threading.Lock()
+        self.tabela = None
+        self.referencias = 0
+        self.derivados = {}
+
+
+class ReferenciaDataset:
+    """
+    Referência de uma sessão a um dataset do armazém.
+    A tabela é compartilhada e não deve ser modificada.
+    """
+
+    def __init__(self, armazem: "ArmazemDatasets", chave: str, tabela: pa.Table):
+        self.chave = chave
+        self.tabela = tabela
+        self._armazem = armazem
+        # o finalizador não pode guardar a própria referência, só a fila e a chave;
+        # também não pode pegar a trava do armazém (ver docstring do módulo)
+        self._finalizador = weakref.finalize(self, armazem._pendentes.append, chave)
+
+    def liberar(self):
+        """
+        Devolve a referência ao armazém (idempotente).
+        """
+        self._finalizador()
+        self._armazem._processar_pendentes()
+
+
+class ArmazemDatasets:
+    """
+    Registro, por hash de conteúdo, dos datasets abertos por memory-map,
+    com contagem de referências. Seguro para uso a partir de várias threads
+    (uma por sessão no Streamlit).
+    """
+
+    def __init__(self, diretorio: str = DIRETORIO_PADRAO, limite_disco: int = LIMITE_DISCO_PADRAO):
+        self.diretorio = diretorio
+        self.limite_disco = limite_disco
+        os.makedirs(diretorio, exist_ok=True)
+        self._trava = threading.Lock()
+        self._entradas = {}
+        # chaves de referências liberadas ainda não descontadas (deque.append é atômico)
+        self._pendentes = collections.deque()
+
+    def adquirir(self, arquivo) -> ReferenciaDataset:
+        """
+        Retorna uma referência ao dataset com o conteúdo de `arquivo`,
+        fazendo o parsing do CSV apenas se esse conteúdo nunca foi visto.
+        """
+        self._processar_pendentes()
+        chave = hash_conteudo(arquivo)
+
+        with self._trava:
+            entrada = self._entradas.setdefault(chave, _Entrada())
+            entrada.referencias += 1
+
+        try:
+            # sessões que enviam o mesmo arquivo ao mesmo tempo esperam um único parsing
+            with entrada.trava:
+                if entrada.tabela is None:
+                    entrada.tabela = self._abrir(chave, arquivo)
+        except Exception:
+            self._pendentes.append(chave)
+            self._processar_pendentes()
+            raise
+
+        return ReferenciaDataset(self, chave, entrada.tabela)
+
+    def resumo_volume(self, referencia: ReferenciaDataset, col_volume: str):
+        """
+        (volume médio, volume máximo) da coluna, calculado uma vez por dataset.
+        """
+        return self._derivado(
+            referencia,
+            ("resumo", col_volume),
+            lambda: resumo_volume_arrow(referencia.tabela, col_volume),
+        )
+
+    def serie_volume(self, referencia: ReferenciaDataset, col_data: str, col_volume: str):
+        """
+        Série (amostrada) do gráfico de volume, calculada uma vez por dataset
+        e par de colunas. O DataFrame é compartilhado: não deve ser modificado.
+        """
+        return self._derivado(
+            referencia,
+            ("serie", col_data, col_volume),
+            lambda: serie_volume(referencia.tabela, col_data, col_volume),
+        )
+
+    def referencias(self, chave: str) -> int:
+        self._processar_pendentes()
+        with self._trava:
+            entrada = self._entradas.get(chave)
+            return entrada.referencias if entrada else 0
+
+    def _derivado(self, referencia: ReferenciaDataset, chave_derivado, calcular):
+        self._processar_pendentes()
+        with self._trava:
+            entrada = self._entradas.get(referencia.chave)
+        if entrada is None:
+            raise ValueError("Referência de dataset já liberada.")
+
+        # sessões que pedem o mesmo derivado ao mesmo tempo esperam um único cálculo
+        with entrada.trava:
+            if chave_derivado not in entrada.derivados:
+                entrada.derivados[chave_derivado] = calcular()
+            return entrada.derivados[chave_derivado]
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, f"{chave}.arrow")
+
+    def _abrir(self, chave: str, arquivo) -> pa.Table:
+        caminho = self._caminho(chave)
+        if not os.path.exists(caminho):
+            tabela = _para_arrow(ler_csv(arquivo))
+            # grava em arquivo temporário e renomeia: outro processo nunca vê um arquivo pela metade
+            temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with pa.OSFile(temporario, "wb") as destino:
+                with pa.ipc.new_file(destino, tabela.schema) as escritor:
+                    escritor.write_table(tabela)
+            os.replace(temporario, caminho)
+            del tabela
+            self._limpar_disco()
+        else:
+            os.utime(caminho)  # marca o uso para a limpeza por antiguidade
+
+        return pa.ipc.open_file(pa.memory_map(caminho, "r")).read_all()
+
+    def _limpar_disco(self):
+        """
+        Apaga os .arrow sem uso neste processo, do mais antigo para o mais
+        recente, até o diretório caber em `limite_disco`.
+        """
+        with self._trava:
+            agora = time.time()
+            for temporario in glob.glob(os.path.join(self.diretorio, "*.tmp")):
+                try:
+                    if agora - os.path.getmtime(temporario) > IDADE_MAXIMA_TEMPORARIO_S:
+                        os.remove(temporario)
+                except OSError:
+                    pass
+
+            arquivos = []
+            for caminho in glob.glob(os.path.join(self.diretorio, "*.arrow")):
+                try:
+                    info = os.stat(caminho)
+                except OSError:
+                    continue
+                arquivos.append((info.st_mtime, info.st_size, caminho))
+
+            total = sum(tamanho for _, tamanho, _ in arquivos)
+            em_uso = {self._caminho(chave) for chave in self._entradas}
+            for _, tamanho, caminho in sorted(arquivos):
+                if total <= self.limite_disco:
+                    break
+                if caminho in em_uso:
+                    continue
+                try:
+                    os.remove(caminho)
+                except OSError:
+                    continue  # ex.: ainda mapeado por outro processo no Windows
+                total -= tamanho
+
+    def _processar_pendentes(self):
+        """
+        Desconta as referências liberadas; entradas que chegam a zero saem do
+        registro e o disco é limpo.
+        """
+        if not self._pendentes:
+            return
+
+        removidas = False
+        with self._trava:
+            while self._pendentes:
+                chave = self._pendentes.popleft()
+                entrada = self._entradas.get(chave)
+                if entrada is None:
+                    continue
+                entrada.referencias -= 1
+                if entrada.referencias <= 0:
+                    # o mapeamento é fechado quando a última visão da tabela for coletada
+                    del self._entradas[chave]
+                    removidas = True
+        if removidas:
+            self._limpar_disco()
+
+
+# ----------------------------------------
+# Cálculos sobre a tabela compartilhada
+# ----------------------------------------
+def previa(tabela: pa.Table, linhas: int = 5) -> pd.DataFrame:
+    """
+    Primeiras linhas como DataFrame (só essas linhas são convertidas).
+    """
+    return tabela.slice(0, linhas).to_pandas()
+
+
+def _volume_numerico(tabela: pa.Table, col_volume: str):
+    coluna = tabela.column(col_volume)
+    if pa.types.is_integer(coluna.type) or pa.types.is_floating(coluna.type):
+        return coluna  # visão direta sobre o arquivo mapeado
+    # coluna de texto: converte apenas ela, descartando valores inválidos como na limpeza
+    return pa.array(pd.to_numeric(coluna.to_pandas(), errors="coerce"), from_pandas=True)
+
+
+def resumo_volume_arrow(tabela: pa.Table, col_volume: str):
+    """
+    Equivalente a limpar_volume + resumo_volume, calculado direto nos buffers
+    Arrow (valores nulos/NaN são ignorados). Retorna (volume médio, volume máximo).
+    """
+    volume = _volume_numerico(tabela, col_volume)
+    media = pc.mean(volume).as_py()
+    maximo = pc.max(volume).as_py()
+    return (
+        float("nan") if media is None else media,
+        float("nan") if maximo is None else maximo,
+    )
+
+
+def serie_volume(tabela: pa.Table, col_data: str, col_volume: str, max_pontos: int = MAX_PONTOS_GRAFICO):
+    """
+    DataFrame pequeno com as colunas de data e volume, já limpo, para o
+    gráfico: acima de `max_pontos` linhas usa uma amostra regular, escolhida
+    na própria tabela Arrow antes de qualquer conversão para pandas.
+    Retorna (DataFrame, datas convertidas com sucesso?).
+    """
+    colunas = [col_data] if col_data == col_volume else [col_data, col_volume]
+    selecao = tabela.select(colunas)
+    if selecao.num_rows > max_pontos:
+        passo = -(-selecao.num_rows // max_pontos)  # divisão arredondando para cima
+        selecao = selecao.take(pa.array(range(0, selecao.num_rows, passo)))
+    df = selecao.to_pandas()
+    convertido = converter_datas(df, col_data)
+    return limpar_volume(df, col_volume), convertido
@@ -0,0 +1,494 @@
+"""
+Suíte de benchmarks do projeto (offline, com dados sintéticos).
+
+Uso (a partir da raiz do projeto):
+
+    python -m benchmarks.bench executar --saida benchmarks/baselines/local.json
+    python -m benchmarks.bench comparar benchmarks/baselines/local.json novo.json --limiar 0.10
+
+O perfil "rapido" (padrão) cobre c de 1 a 10^4 e CSVs de 10^4 a 10^6 linhas
+(leitura completa e reabertura pelo armazém compartilhado);
+o perfil "completo" vai até 10^8 linhas (gera alguns GB em disco temporário).
+"""
+import argparse
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import timeit
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from armazem import ArmazemDatasets, resumo_volume_arrow  # noqa: E402
+from dataset import (  # noqa: E402
+    converter_datas,
+    estimar_lambdas,
+    ler_csv,
+    limpar_volume,
+    resumo_volume,
+)
+from filas import (  # noqa: E402
+    curva_metricas,
+    grade_lambda,
+    mm1_metrics,
+    mm1_metrics_batch,
+    mmc_metrics,
+    mmc_metrics_batch,
+)
+from graficos import (  # noqa: E402
+    grafico_comparativo,
+    grafico_curva_w,
+    grafico_metricas,
+    grafico_volume,
+)
+
+
+SEMENTE = 42
+
+PERFIS = {
+    "rapido": {
+        "servidores": [1, 10, 100, 1000, 10000],
+        "linhas_csv": [10 ** 4, 10 ** 5, 10 ** 6],
+        "tamanho_lote": 10 ** 4,
+        "pontos_grafico": [10 ** 3, 10 ** 5],
+    },
+    "completo": {
+        "servidores": [1, 10, 100, 1000, 10000],
+        "linhas_csv": [10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7, 10 ** 8],
+        "tamanho_lote": 10 ** 5,
+        "pontos_grafico": [10 ** 3, 10 ** 5, 10 ** 6],
+    },
+}
+
+# Escrita do CSV sintético em blocos, para não manter 10^8 linhas na memória
+LINHAS_POR_BLOCO = 10 ** 6
+
+# Duração mínima de cada amostra: chamadas de poucos µs são repetidas até somar isso
+TEMPO_MINIMO_AMOSTRA_S = 0.2
+
+
+# ----------------------------------------
+# Medição
+# ----------------------------------------
+def _carga_referencia():
+    """
+    Carga fixa em Python puro, medida entre as amostras de cada caso.
+    """
+    total = 0
+    for i in range(20000):
+        total += i * i
+    return total
+
+
+def _chamadas_por_amostra(timer: timeit.Timer) -> int:
+    """
+    1, 2, 5, 10, 20, 50, ... chamadas (como no timeit.Timer.autorange), até a
+    amostra durar pelo menos TEMPO_MINIMO_AMOSTRA_S.
+    """
+    base = 1
+    while True:
+        for chamadas in (base, 2 * base, 5 * base):
+            if timer.timeit(chamadas) >= TEMPO_MINIMO_AMOSTRA_S:
+                return chamadas
+        base *= 10
+
+
+def medir(funcao, repeticoes: int):
+    """
+    Mede o tempo por chamada de `funcao` em `repeticoes` amostras de pelo
+    menos TEMPO_MINIMO_AMOSTRA_S cada.
+
+    Entre as amostras roda a carga de referência; "relativo" é a mediana de
+    (tempo do caso / tempo da referência vizinha), o que desconta variações de
+    velocidade da máquina inteira (frequência da CPU, vizinhos em VMs) que
+    deslocam todos os tempos de uma execução. A "dispersao" dos relativos,
+    (mediana - mínimo) / mínimo, é a folga de ruído usada na comparação.
+    """
+    timer = timeit.Timer(funcao)
+    referencia = timeit.Timer(_carga_referencia)
+    chamadas = _chamadas_por_amostra(timer)
+    chamadas_referencia = _chamadas_por_amostra(referencia)
+
+    def tempo_referencia():
+        return referencia.timeit(chamadas_referencia) / chamadas_referencia
+
+    amostras = []
+    relativos = []
+    antes = tempo_referencia()
+    for _ in range(repeticoes):
+        tempo = timer.timeit(chamadas) / chamadas
+        depois = tempo_referencia()
+        amostras.append(tempo)
+        relativos.append(tempo / ((antes + depois) / 2))
+        antes = depois
+
+    relativo = statistics.median(relativos)
+    return {
+        "min_s": min(amostras),
+        "mediana_s": statistics.median(amostras),
+        "max_s": max(amostras),
+        "relativo": relativo,
+        "dispersao": relativo / min(relativos) - 1,
+        "repeticoes": repeticoes,
+        "chamadas": chamadas,
+    }
+
+
+# ----------------------------------------
+# Dados sintéticos
+# ----------------------------------------
+def gerar_csv(caminho: str, linhas: int, rng):
+    """
+    Gera um CSV no formato do historical_daily_volume (date, volume_24h_total).
+    Cerca de 0,1% dos volumes ficam vazios para exercitar a limpeza.
+    """
+    inicio = pd.Timestamp("2013-04-28")
+    with open(caminho, "w", newline="") as arquivo:
+        arquivo.write("date,volume_24h_total\n")
+        for offset in range(0, linhas, LINHAS_POR_BLOCO):
+            n = min(LINHAS_POR_BLOCO, linhas - offset)
+            datas = pd.date_range(inicio + pd.Timedelta(days=offset), periods=n, freq="D")
+            volumes = pd.Series(rng.lognormal(mean=23.0, sigma=1.0, size=n))
+            volumes[rng.random(n) < 0.001] = np.nan
+            bloco = pd.DataFrame({"date": datas.strftime("%Y-%m-%d"), "volume_24h_total": volumes})
+            bloco.to_csv(arquivo, header=False, index=False)
+
+
+def pipeline_csv(caminho: str):
+    """
+    Mesmo caminho percorrido pela aba de upload até a estimativa de λ.
+    """
+    df = ler_csv(caminho)
+    converter_datas(df, "date")
+    df_limp = limpar_volume(df, "volume_24h_total")
+    volume_medio, volume_max = resumo_volume(df_limp, "volume_24h_total")
+    return estimar_lambdas(volume_medio, volume_max)
+
+
+def resumo_compartilhado(armazem, caminho: str):
+    """
+    Caminho de uma sessão que envia um CSV já presente no armazém:
+    hash do conteúdo, memory-map do .arrow e média/máximo sem cópia.
+    """
+    with open(caminho, "rb") as arquivo:
+        referencia = armazem.adquirir(arquivo)
+    resultado = resumo_volume_arrow(referencia.tabela, "volume_24h_total")
+    referencia.liberar()
+    return resultado
+
+
+def mover_slider(lambdas, passo: float, curva, lmbda: float):
+    """
+    Trabalho do servidor a cada movimento do slider de λ no modo interativo:
+    leitura no vetor pré-calculado, montagem da especificação Vega-Lite e
+    serialização em JSON (o que o Streamlit envia ao navegador).
+    """
+    indice = int(round(lmbda / passo))
+    W_atual = float(curva["W"][indice])
+    return json.dumps(grafico_curva_w(lambdas, curva["W"], [("λ atual", lmbda, W_atual)]))
+
+
+def renderizar(fig):
+    """
+    Renderiza a figura em PNG, como o st.pyplot faz, e libera a memória.
+    """
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    plt.close(fig)
+    return buffer.getbuffer().nbytes
+
+
+# ----------------------------------------
+# Casos de benchmark
+# ----------------------------------------
+def casos_filas(perfil: dict):
+    rng = np.random.default_rng([SEMENTE, 1])
+    mu = 50.0
+    lote = perfil["tamanho_lote"]
+
+    yield "mm1_escalar", (lambda: mm1_metrics(30.0, mu))
+
+    lambdas_mm1 = rng.uniform(0, mu, size=lote)
+    yield f"mm1_lote[n={lote}]", (lambda: mm1_metrics_batch(lambdas_mm1, mu))
+
+    for c in perfil["servidores"]:
+        lmbda = 0.9 * c * mu
+        yield f"mmc_escalar[c={c}]", (lambda lmbda=lmbda, c=c: mmc_metrics(lmbda, mu, c))
+
+        lambdas_mmc = rng.uniform(0, c * mu, size=lote)
+        yield (
+            f"mmc_lote[c={c},n={lote}]",
+            (lambda lambdas=lambdas_mmc, c=c: mmc_metrics_batch(lambdas, mu, c)),
+        )
+
+
+def casos_csv(perfil: dict, diretorio: str, selecionado):
+    for linhas in perfil["linhas_csv"]:
+        nome_ingestao = f"ingestao_csv[linhas={linhas}]"
+        nome_armazem = f"armazem_resumo[linhas={linhas}]"
+        # o CSV (até alguns GB) só é gerado se algum caso desse tamanho for rodar
+        if not (selecionado(nome_ingestao) or selecionado(nome_armazem)):
+            continue
+
+        caminho = os.path.join(diretorio, f"volume_{linhas}.csv")
+        gerar_csv(caminho, linhas, np.random.default_rng([SEMENTE, linhas]))
+        yield nome_ingestao, (lambda caminho=caminho: pipeline_csv(caminho))
+
+        # o aquecimento faz o parsing; as amostras medem só a reabertura compartilhada
+        armazem = ArmazemDatasets(os.path.join(diretorio, f"armazem_{linhas}"))
+        yield (
+            nome_armazem,
+            (lambda armazem=armazem, caminho=caminho: resumo_compartilhado(armazem, caminho)),
+        )
+        os.remove(caminho)
+
+
+def casos_graficos(perfil: dict):
+    rng = np.random.default_rng([SEMENTE, 2])
+    metricas = {"ρ": 0.6, "L": 1.5, "Lq": 0.9, "W": 0.05, "Wq": 0.03}
+    yield "grafico_metricas", (lambda: renderizar(grafico_metricas(metricas, "M/M/1")))
+    yield (
+        "grafico_comparativo",
+        (lambda: renderizar(grafico_comparativo(metricas, metricas))),
+    )
+
+    # modo interativo: mesma grade do app (1000 pontos de ρ = 0 até λ = c·μ)
+    mu = 50.0
+    for modelo, c in (("M/M/1", 1), ("M/M/c", 100)):
+        lambdas, passo = grade_lambda(mu, c, 1000)
+        yield (
+            f"curva_interativa[{modelo},c={c}]",
+            (lambda modelo=modelo, c=c, lambdas=lambdas: curva_metricas(modelo, lambdas, mu, c)),
+        )
+        curva = curva_metricas(modelo, lambdas, mu, c)
+        yield (
+            f"slider_interativo[{modelo},c={c}]",
+            (
+                lambda lambdas=lambdas, passo=passo, curva=curva:
+                mover_slider(lambdas, passo, curva, 0.9 * lambdas[-1])
+            ),
+        )
+
+    for pontos in perfil["pontos_grafico"]:
+        datas = pd.date_range("2013-04-28", periods=pontos, freq="D")
+        volumes = rng.lognormal(mean=23.0, sigma=1.0, size=pontos)
+        yield (
+            f"grafico_volume[pontos={pontos}]",
+            (lambda datas=datas, volumes=volumes: renderizar(grafico_volume(datas, volumes))),
+        )
+
+
+def executar(perfil_nome: str, repeticoes: int, filtro: str = None):
+    """
+    Roda os casos do perfil (só os que contêm `filtro`, se informado) e
+    retorna o documento JSON de resultados. O progresso vai para o stderr,
+    deixando o stdout livre para o JSON.
+    Cada grupo (e cada tamanho de CSV) tem sua própria semente, então os dados
+    sintéticos de um caso não dependem de quais outros casos foram filtrados.
+    """
+    perfil = PERFIS[perfil_nome]
+    resultados = {}
+
+    def selecionado(nome: str) -> bool:
+        return not filtro or filtro in nome
+
+    with tempfile.TemporaryDirectory(prefix="bench_filas_") as diretorio:
+        grupos = [
+            casos_filas(perfil),
+            casos_csv(perfil, diretorio, selecionado),
+            casos_graficos(perfil),
+        ]
+        for grupo in grupos:
+            for nome, funcao in grupo:
+                if not selecionado(nome):
+                    continue
+                funcao()  # aquecimento (imports tardios, caches do matplotlib, parsing do armazém etc.)
+                resultados[nome] = medir(funcao, repeticoes)
+                print(
+                    f"{nome:<40} {resultados[nome]['mediana_s'] * 1e3:12.4f} ms "
+                    f"(relativo {resultados[nome]['relativo']:.4g} ±{resultados[nome]['dispersao']:.1%})",
+                    file=sys.stderr,
+                    flush=True,
+                )
+
+    return {
+        "metadados": {
+            "perfil": perfil_nome,
+            "filtro": filtro,
+            "data": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "processador": platform.processor() or platform.machine(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "matplotlib": matplotlib.__version__,
+        },
+        "resultados": resultados,
+    }
+
+
+# ----------------------------------------
+# Comparação com baseline
+# ----------------------------------------
+def comparar(baseline: dict, atual: dict, limiar: float, saida=sys.stdout):
+    """
+    Compara caso a caso os tempos relativos à carga de referência (ver
+    `medir`), escrevendo a tabela em `saida`. Um caso é regressão quando fica
+    mais lento do que (1 + limiar + dispersão da baseline) × baseline: a
+    dispersão medida na baseline é a folga de ruído.
+    Retorna (regressões, casos da baseline ausentes na execução atual).
+    """
+    base = baseline["resultados"]
+    novo = atual["resultados"]
+    regressoes = []
+    ausentes = []
+
+    print(
+        f"{'caso':<40} {'baseline (ms)':>14} {'atual (ms)':>14} {'razão rel.':>11} {'tolerância':>11}",
+        file=saida,
+    )
+    for nome in sorted(set(base) | set(novo)):
+        if nome not in novo:
+            ausentes.append(nome)
+            print(f"{nome:<40} {'(ausente na execução atual)':>41}  <-- AUSENTE", file=saida)
+            continue
+        if nome not in base:
+            print(f"{nome:<40} {'(novo, sem baseline)':>41}", file=saida)
+            continue
+
+        razao = novo[nome]["relativo"] / base[nome]["relativo"]
+        tolerancia = 1 + limiar + base[nome]["dispersao"]
+        marca = ""
+        if razao > tolerancia:
+            regressoes.append(nome)
+            marca = "  <-- REGRESSÃO"
+        print(
+            f"{nome:<40} {base[nome]['mediana_s'] * 1e3:14.4f} "
+            f"{novo[nome]['mediana_s'] * 1e3:14.4f} {razao:11.2f} {tolerancia:11.2f}{marca}",
+            file=saida,
+        )
+
+    return regressoes, ausentes
+
+
+def verificar_metadados(baseline: dict, atual: dict):
+    """
+    Diferenças que tornam a comparação inválida (perfil) ou suspeita (máquina).
+    Retorna (erros, avisos).
+    """
+    base = baseline["metadados"]
+    novo = atual["metadados"]
+    erros = []
+    avisos = []
+
+    if base.get("perfil") != novo.get("perfil"):
+        erros.append(f"perfis diferentes: baseline {base.get('perfil')!r}, atual {novo.get('perfil')!r}")
+    for campo in ("processador", "plataforma", "python"):
+        if base.get(campo) != novo.get(campo):
+            avisos.append(f"{campo} diferente: baseline {base.get(campo)!r}, atual {novo.get(campo)!r}")
+
+    return erros, avisos
+
+
+def _ler_json(caminho: str):
+    with open(caminho, encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks dos modelos de fila e do pipeline de dataset.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p_exec = sub.add_parser("executar", help="Roda os benchmarks e grava o resultado em JSON.")
+    p_exec.add_argument("--perfil", choices=sorted(PERFIS), default="rapido")
+    p_exec.add_argument("--repeticoes", type=int, default=5)
+    p_exec.add_argument("--filtro", help="Roda apenas casos cujo nome contenha este texto.")
+    p_exec.add_argument(
+        "--saida",
+        help="Arquivo JSON de saída (padrão: JSON no stdout, progresso no stderr).",
+    )
+    p_exec.add_argument(
+        "--comparar-com",
+        help="Baseline JSON para comparar logo após a execução.",
+    )
+    p_exec.add_argument("--limiar", type=float, default=0.10)
+    p_exec.add_argument(
+        "--permitir-ausentes",
+        action="store_true",
+        help="Casos da baseline que não rodaram (ex.: --filtro) viram aviso em vez de erro.",
+    )
+
+    p_comp = sub.add_parser("comparar", help="Compara dois JSONs e sinaliza regressões.")
+    p_comp.add_argument("baseline")
+    p_comp.add_argument("atual")
+    p_comp.add_argument(
+        "--limiar",
+        type=float,
+        default=0.10,
+        help="Fração de piora tolerada no tempo relativo, além do ruído da baseline (0.10 = 10%%).",
+    )
+    p_comp.add_argument(
+        "--permitir-ausentes",
+        action="store_true",
+        help="Casos da baseline ausentes no JSON atual viram aviso em vez de erro.",
+    )
+
+    args = parser.parse_args(argv)
+    # relatório humano no stdout, exceto quando o stdout carrega o JSON da execução
+    relatorio = sys.stdout
+
+    if args.comando == "executar":
+        documento = executar(args.perfil, args.repeticoes, args.filtro)
+        if args.saida:
+            os.makedirs(os.path.dirname(os.path.abspath(args.saida)), exist_ok=True)
+            with open(args.saida, "w", encoding="utf-8") as arquivo:
+                json.dump(documento, arquivo, indent=2, ensure_ascii=False)
+            print(f"Resultados gravados em {args.saida}", file=sys.stderr)
+        else:
+            print(json.dumps(documento, indent=2, ensure_ascii=False))
+            relatorio = sys.stderr
+
+        if not args.comparar_com:
+            return 0
+        baseline = _ler_json(args.comparar_com)
+    else:
+        baseline = _ler_json(args.baseline)
+        documento = _ler_json(args.atual)
+
+    erros, avisos = verificar_metadados(baseline, documento)
+    for aviso in avisos:
+        print(f"AVISO: {aviso}", file=relatorio)
+
+    regressoes, ausentes = comparar(baseline, documento, args.limiar, relatorio)
+    if ausentes:
+        mensagem = f"{len(ausentes)} caso(s) da baseline não foram executados: {', '.join(ausentes)}"
+        if args.permitir_ausentes:
+            print(f"\nAVISO: {mensagem}", file=relatorio)
+        else:
+            erros.append(mensagem)
+
+    for erro in erros:
+        print(f"\nERRO: {erro}", file=relatorio)
+    if regressoes:
+        print(
+            f"\n{len(regressoes)} caso(s) acima do limiar de {args.limiar:.0%} (+ ruído da baseline): "
+            f"{', '.join(regressoes)}",
+            file=relatorio,
+        )
+    if erros or regressoes:
+        return 1
+    print(f"\nNenhuma regressão acima de {args.limiar:.0%} (+ ruído da baseline).", file=relatorio)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
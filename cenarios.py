@@ -0,0 +1,362 @@
+"""
+Execução em lote de cenários de fila ("what-if") com resultados em SQLite.
+
+Uso (a partir da raiz do projeto):
+
+    python cenarios.py cenarios_exemplo.json --banco cenarios.db --processos 4
+
+O arquivo de cenários é um JSON com uma lista de "grades". Cada grade gera o
+produto cartesiano dos seus campos; cada campo aceita um valor, uma lista ou
+um intervalo {"de": 1, "ate": 10, "passo": 1}:
+
+    {
+      "datasets": {"cmc": "data/historical_daily_volume_reduzido.csv"},
+      "grades": [
+        {
+          "modelo": ["M/M/c", "M/M/c/K"],
+          "lambda": [25.0, {"dataset": "cmc", "estatistica": "pico"}],
+          "mu": [10, 20],
+          "c": {"de": 1, "ate": 8},
+          "K": [50, 100]
+        }
+      ]
+    }
+
+Cenários cujas entradas (parâmetros, valor de λ e versão das fórmulas) já
+estão no banco não são recalculados.
+"""
+import argparse
+import datetime
+import hashlib
+import itertools
+import json
+import math
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from dataset import estimar_lambdas, ler_csv, limpar_volume, resumo_volume
+from filas import mm1_metrics, mm1k_metrics, mmc_metrics, mmck_metrics
+
+
+# Incrementar quando as fórmulas mudarem, para invalidar resultados antigos
+VERSAO_MODELOS = 1
+
+# Incrementar quando o esquema ou o cálculo de `chave` mudarem (PRAGMA user_version)
+VERSAO_BANCO = 2
+
+MODELOS = ("M/M/1", "M/M/c", "M/M/1/K", "M/M/c/K")
+
+METRICAS = ("rho", "L", "Lq", "W", "Wq", "P0", "PK")
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS cenarios (
+    chave TEXT PRIMARY KEY,
+    entrada TEXT NOT NULL,
+    modelo TEXT NOT NULL,
+    origem_lambda TEXT NOT NULL,
+    lmbda REAL NOT NULL,
+    mu REAL NOT NULL,
+    c INTEGER NOT NULL,
+    K INTEGER,
+    estavel INTEGER NOT NULL,
+    rho REAL,
+    L REAL,
+    Lq REAL,
+    W REAL,
+    Wq REAL,
+    P0 REAL,
+    PK REAL,
+    calculado_em TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cenarios_parametros
+    ON cenarios (modelo, origem_lambda, mu, c, K);
+CREATE INDEX IF NOT EXISTS idx_cenarios_lambda
+    ON cenarios (modelo, mu, c, lmbda);
+"""
+
+
+# ----------------------------------------
+# Leitura do arquivo de cenários
+# ----------------------------------------
+def _expandir_valor(valor):
+    """
+    Converte o valor de um campo da grade em lista de valores.
+    """
+    if isinstance(valor, list):
+        return valor
+    if isinstance(valor, dict) and "de" in valor:
+        passo = valor.get("passo", 1)
+        n = int(math.floor((valor["ate"] - valor["de"]) / passo + 1e-9)) + 1
+        return [valor["de"] + i * passo for i in range(max(n, 0))]
+    return [valor]
+
+
+def _lambdas_dataset(caminho: str, coluna: str):
+    """
+    Estima (λ médio, λ pico) do CSV usando o mesmo pipeline da aba de upload.
+    """
+    df_limp = limpar_volume(ler_csv(caminho), coluna)
+    return estimar_lambdas(*resumo_volume(df_limp, coluna))
+
+
+def _resolver_lambda(fonte, datasets: dict, cache: dict):
+    """
+    Retorna (origem, valor de λ) para um número ou uma referência a dataset.
+    """
+    if not isinstance(fonte, dict):
+        return "fixo", float(fonte)
+
+    nome = fonte["dataset"]
+    estatistica = fonte.get("estatistica", "medio")
+    coluna = fonte.get("coluna", "volume_24h_total")
+    if estatistica not in ("medio", "pico"):
+        raise ValueError(f"Estatística de λ inválida: {estatistica!r} (use 'medio' ou 'pico').")
+    if nome not in datasets:
+        raise ValueError(f"Dataset {nome!r} não declarado em 'datasets'.")
+
+    if (nome, coluna) not in cache:
+        cache[(nome, coluna)] = _lambdas_dataset(datasets[nome], coluna)
+    lambda_medio, lambda_pico = cache[(nome, coluna)]
+
+    valor = lambda_medio if estatistica == "medio" else lambda_pico
+    return f"dataset:{nome}:{coluna}:{estatistica}", float(valor)
+
+
+def _normalizar(modelo: str, origem: str, lmbda: float, mu, c, K):
+    """
+    Ajusta os parâmetros ao modelo (M/M/1 ignora c e K, modelos sem K ignoram K)
+    para que combinações equivalentes virem o mesmo cenário.
+    """
+    if modelo not in MODELOS:
+        raise ValueError(f"Modelo desconhecido: {modelo!r}. Use um de {', '.join(MODELOS)}.")
+
+    if modelo in ("M/M/1", "M/M/1/K"):
+        c = 1
+    if not modelo.endswith("/K"):
+        K = None
+    elif K is None:
+        raise ValueError(f"O modelo {modelo} exige o campo 'K'.")
+
+    return {
+        "modelo": modelo,
+        "origem_lambda": origem,
+        "lmbda": float(lmbda),
+        "mu": float(mu),
+        "c": int(c),
+        "K": None if K is None else int(K),
+    }
+
+
+def carregar_cenarios(caminho: str):
+    """
+    Lê o arquivo JSON e devolve a lista de cenários (dicts) sem duplicatas.
+    Caminhos de datasets são relativos ao próprio arquivo de cenários.
+    """
+    with open(caminho, encoding="utf-8") as arquivo:
+        especificacao = json.load(arquivo)
+
+    base = os.path.dirname(os.path.abspath(caminho))
+    datasets = {
+        nome: os.path.join(base, caminho_csv)
+        for nome, caminho_csv in especificacao.get("datasets", {}).items()
+    }
+
+    cache_lambdas = {}
+    cenarios = {}
+    for grade in especificacao.get("grades", []):
+        campos = [
+            _expandir_valor(grade.get("modelo", "M/M/1")),
+            _expandir_valor(grade["lambda"]),
+            _expandir_valor(grade["mu"]),
+            _expandir_valor(grade.get("c", 1)),
+            _expandir_valor(grade.get("K")),
+        ]
+        for modelo, fonte, mu, c, K in itertools.product(*campos):
+            origem, lmbda = _resolver_lambda(fonte, datasets, cache_lambdas)
+            cenario = _normalizar(modelo, origem, lmbda, mu, c, K)
+            cenarios[chave_cenario(cenario)] = cenario
+
+    return list(cenarios.values())
+
+
+# ----------------------------------------
+# Chaves e avaliação
+# ----------------------------------------
+def _hash(*partes):
+    return hashlib.sha256(json.dumps(partes).encode("utf-8")).hexdigest()
+
+
+def chave_cenario(cenario: dict) -> str:
+    """
+    Identidade do cenário: modelo, origem de λ, μ, c e K. Para λ fixo o próprio
+    valor faz parte da identidade; para λ de dataset, não: o valor resolvido
+    entra só em hash_entrada, para que um CSV alterado recalcule a mesma linha.
+    """
+    lmbda = cenario["lmbda"] if cenario["origem_lambda"] == "fixo" else None
+    return _hash(
+        cenario["modelo"], cenario["origem_lambda"], lmbda, cenario["mu"], cenario["c"], cenario["K"]
+    )
+
+
+def hash_entrada(cenario: dict) -> str:
+    """
+    Hash de tudo que influencia o resultado (inclui o valor de λ, que muda
+    quando o dataset muda, e a versão das fórmulas).
+    """
+    return _hash(chave_cenario(cenario), repr(cenario["lmbda"]), VERSAO_MODELOS)
+
+
+def avaliar(cenario: dict) -> dict:
+    """
+    Calcula as métricas de um cenário. Função de módulo para poder ser
+    enviada aos processos do ProcessPoolExecutor.
+    """
+    modelo = cenario["modelo"]
+    lmbda, mu, c, K = cenario["lmbda"], cenario["mu"], cenario["c"], cenario["K"]
+
+    if modelo == "M/M/1":
+        resultados = mm1_metrics(lmbda, mu)
+    elif modelo == "M/M/c":
+        resultados = mmc_metrics(lmbda, mu, c)
+    elif modelo == "M/M/1/K":
+        resultados = mm1k_metrics(lmbda, mu, K)
+    else:
+        resultados = mmck_metrics(lmbda, mu, c, K)
+
+    linha = dict(cenario)
+    linha["estavel"] = resultados is not None
+    for metrica in METRICAS:
+        linha[metrica] = None if resultados is None else resultados.get(metrica)
+    return linha
+
+
+# ----------------------------------------
+# Banco SQLite
+# ----------------------------------------
+def abrir_banco(caminho: str) -> sqlite3.Connection:
+    conexao = sqlite3.connect(caminho)
+    conexao.executescript(ESQUEMA)
+    versao = conexao.execute("PRAGMA user_version").fetchone()[0]
+    if versao < VERSAO_BANCO:
+        # chaves de versões antigas não batem com as atuais; os resultados são recalculáveis
+        with conexao:
+            conexao.execute("DELETE FROM cenarios")
+            conexao.execute(f"PRAGMA user_version = {VERSAO_BANCO}")
+    return conexao
+
+
+def _pendentes(conexao: sqlite3.Connection, cenarios: list):
+    """
+    Filtra os cenários cujo hash de entrada ainda não está no banco.
+    """
+    existentes = {
+        chave: entrada for chave, entrada in conexao.execute("SELECT chave, entrada FROM cenarios")
+    }
+    return [c for c in cenarios if existentes.get(chave_cenario(c)) != hash_entrada(c)]
+
+
+def salvar(conexao: sqlite3.Connection, linhas: list):
+    agora = datetime.datetime.now().isoformat(timespec="seconds")
+    colunas = (
+        "chave", "entrada", "modelo", "origem_lambda", "lmbda", "mu", "c", "K", "estavel",
+    ) + METRICAS + ("calculado_em",)
+    registros = [
+        (
+            chave_cenario(linha), hash_entrada(linha), linha["modelo"], linha["origem_lambda"],
+            linha["lmbda"], linha["mu"], linha["c"], linha["K"], int(linha["estavel"]),
+        )
+        + tuple(linha[m] for m in METRICAS)
+        + (agora,)
+        for linha in linhas
+    ]
+    with conexao:
+        conexao.executemany(
+            f"INSERT OR REPLACE INTO cenarios ({', '.join(colunas)}) "
+            f"VALUES ({', '.join('?' * len(colunas))})",
+            registros,
+        )
+
+
+def executar(cenarios: list, caminho_banco: str, processos: int = None):
+    """
+    Avalia em paralelo os cenários pendentes e grava no banco.
+    Retorna (quantidade calculada, quantidade reaproveitada).
+    """
+    conexao = abrir_banco(caminho_banco)
+    try:
+        pendentes = _pendentes(conexao, cenarios)
+        if not pendentes:
+            return 0, len(cenarios)
+
+        processos = processos or os.cpu_count() or 1
+        if processos == 1 or len(pendentes) < 2:
+            linhas = [avaliar(c) for c in pendentes]
+        else:
+            # blocos grandes: cada cenário leva micro/milissegundos
+            bloco = max(1, math.ceil(len(pendentes) / (processos * 4)))
+            with ProcessPoolExecutor(max_workers=processos) as executor:
+                linhas = list(executor.map(avaliar, pendentes, chunksize=bloco))
+
+        salvar(conexao, linhas)
+        return len(pendentes), len(cenarios) - len(pendentes)
+    finally:
+        conexao.close()
+
+
+def consultar(caminho_banco: str, **filtros) -> pd.DataFrame:
+    """
+    Lê os resultados salvos como DataFrame. Filtros opcionais por coluna
+    (ex.: modelo="M/M/c", mu=20.0); valores None são ignorados.
+    """
+    condicoes = []
+    valores = []
+    for coluna, valor in filtros.items():
+        if valor is None:
+            continue
+        if coluna not in ("modelo", "origem_lambda", "lmbda", "mu", "c", "K"):
+            raise ValueError(f"Filtro inválido: {coluna!r}")
+        condicoes.append(f"{coluna} = ?")
+        valores.append(valor)
+
+    consulta = "SELECT * FROM cenarios"
+    if condicoes:
+        consulta += " WHERE " + " AND ".join(condicoes)
+
+    conexao = sqlite3.connect(f"file:{caminho_banco}?mode=ro", uri=True)
+    try:
+        return pd.read_sql_query(consulta, conexao, params=valores)
+    finally:
+        conexao.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Executa cenários de fila em lote e salva em SQLite.")
+    parser.add_argument("arquivo", help="Arquivo JSON com as grades de cenários.")
+    parser.add_argument("--banco", default="cenarios.db", help="Banco SQLite de resultados.")
+    parser.add_argument(
+        "--processos",
+        type=int,
+        default=None,
+        help="Número de processos (padrão: todos os núcleos).",
+    )
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    cenarios = carregar_cenarios(args.arquivo)
+    calculados, reaproveitados = executar(cenarios, args.banco, args.processos)
+    duracao = time.perf_counter() - inicio
+
+    print(
+        f"{len(cenarios)} cenário(s): {calculados} calculado(s), "
+        f"{reaproveitados} já no banco ({duracao:.2f} s). Resultados em {args.banco}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
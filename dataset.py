@@ -0,0 +1,51 @@
+import pandas as pd
+
+
+SEGUNDOS_DIA = 24 * 3600
+
+
+# ----------------------------------------
+# Leitura e limpeza do dataset de volume diário
+# ----------------------------------------
+def ler_csv(arquivo) -> pd.DataFrame:
+    """
+    Lê o CSV enviado (caminho ou arquivo aberto) em um DataFrame.
+    Erros de leitura são propagados para quem chamou.
+    """
+    return pd.read_csv(arquivo)
+
+
+def converter_datas(df: pd.DataFrame, col_data: str) -> bool:
+    """
+    Converte a coluna de data para datetime, no próprio DataFrame.
+    Retorna False se a conversão automática não for possível.
+    """
+    try:
+        df[col_data] = pd.to_datetime(df[col_data])
+    except Exception:
+        return False
+    return True
+
+
+def limpar_volume(df: pd.DataFrame, col_volume: str) -> pd.DataFrame:
+    """
+    Remove linhas sem volume e converte a coluna para numérico,
+    descartando valores que não puderem ser convertidos.
+    """
+    df_limp = df.dropna(subset=[col_volume]).copy()
+    df_limp[col_volume] = pd.to_numeric(df_limp[col_volume], errors="coerce")
+    return df_limp.dropna(subset=[col_volume])
+
+
+def resumo_volume(df_limp: pd.DataFrame, col_volume: str):
+    """
+    Retorna (volume médio, volume máximo) da coluna de volume já limpa.
+    """
+    return df_limp[col_volume].mean(), df_limp[col_volume].max()
+
+
+def estimar_lambdas(volume_medio: float, volume_max: float):
+    """
+    Estima (λ médio, λ pico) em req/s assumindo que cada linha é um dia.
+    """
+    return volume_medio / SEGUNDOS_DIA, volume_max / SEGUNDOS_DIA
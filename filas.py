@@ -0,0 +1,235 @@
+import math
+
+import numpy as np
+
+
+# ----------------------------------------
+# Funções de métricas de fila (escalares)
+# ----------------------------------------
+def mm1_metrics(lmbda: float, mu: float):
+    """
+    Calcula métricas do modelo M/M/1.
+    λ (lmbda) e μ (mu) em requisições por segundo.
+    Retorna dict ou None se o sistema for instável.
+    """
+    if lmbda <= 0 or mu <= 0:
+        return None
+
+    if lmbda >= mu:
+        # Sistema instável (ρ >= 1)
+        return None
+
+    rho = lmbda / mu  # Utilização
+    L = rho / (1 - rho)  # Número médio no sistema
+    Lq = (rho ** 2) / (1 - rho)  # Número médio na fila
+    W = 1 / (mu - lmbda)  # Tempo médio no sistema (s)
+    Wq = lmbda / (mu * (mu - lmbda))  # Tempo médio na fila (s)
+
+    return {
+        "rho": rho,
+        "L": L,
+        "Lq": Lq,
+        "W": W,
+        "Wq": Wq,
+    }
+
+
+def mmc_metrics(lmbda: float, mu: float, c: int):
+    """
+    Calcula métricas do modelo M/M/c (c servidores idênticos).
+    Fórmulas clássicas com Erlang C.
+    λ e μ em req/s.
+
+    Erlang B é obtido pela recorrência B(k) = a·B(k-1) / (k + a·B(k-1)) e a
+    soma de P0 sai do próprio B (B = (a**c / c!) / soma), em escala
+    logarítmica, evitando a**c e c! (que estouram o float a partir de c ≈ 170).
+
+    Retorna dict ou None se sistema for instável ou parâmetros inválidos.
+    """
+    if lmbda <= 0 or mu <= 0 or c <= 0:
+        return None
+
+    # taxa de utilização global
+    rho = lmbda / (c * mu)
+    if rho >= 1:
+        # sistema instável
+        return None
+
+    a = lmbda / mu  # tráfego oferecido
+
+    erlang_b = 1.0
+    for n in range(1, c + 1):
+        erlang_b = a * erlang_b / (n + a * erlang_b)
+
+    # log(soma de a**k / k! para k <= c); se B some no float a soma já é e**a
+    log_termo = c * math.log(a) - math.lgamma(c + 1)
+    log_soma = log_termo - math.log(erlang_b) if erlang_b > 0 else a
+
+    # Erlang C (probabilidade de esperar na fila)
+    erlang_c = erlang_b / (1 - rho * (1 - erlang_b))
+
+    # P0 (probabilidade de zero clientes no sistema)
+    P0 = math.exp(-log_soma) / (1 - erlang_b + erlang_b / (1 - rho))
+
+    Lq = erlang_c * rho / (1 - rho)  # clientes médios em fila
+
+    L = Lq + a            # clientes médios no sistema
+    Wq = Lq / lmbda       # tempo médio em fila
+    W = Wq + 1 / mu       # tempo médio no sistema
+
+    return {
+        "rho": rho,
+        "L": L,
+        "Lq": Lq,
+        "W": W,
+        "Wq": Wq,
+        "P0": P0,
+    }
+
+
+# ----------------------------------------
+# Funções de métricas de fila (em lote)
+# ----------------------------------------
+def mm1_metrics_batch(lmbdas, mu: float):
+    """
+    Versão vetorizada de mm1_metrics para um vetor de λ.
+    Retorna dict de arrays numpy; posições inválidas ou instáveis
+    (λ <= 0, μ <= 0 ou λ >= μ) ficam com NaN.
+    """
+    lmbdas = np.asarray(lmbdas, dtype=float)
+    validos = (lmbdas > 0) & (mu > 0) & (lmbdas < mu)
+    lam = np.where(validos, lmbdas, np.nan)
+
+    rho = lam / mu
+    return {
+        "rho": rho,
+        "L": rho / (1 - rho),
+        "Lq": (rho ** 2) / (1 - rho),
+        "W": 1 / (mu - lam),
+        "Wq": lam / (mu * (mu - lam)),
+    }
+
+
+def mmc_metrics_batch(lmbdas, mu: float, c: int):
+    """
+    Versão vetorizada de mmc_metrics para um vetor de λ (μ e c fixos).
+    Usa a mesma recorrência de Erlang B, com custo O(c) operações vetoriais.
+    Retorna dict de arrays numpy; posições inválidas ou instáveis ficam com NaN.
+    """
+    lmbdas = np.asarray(lmbdas, dtype=float)
+    c = int(c)
+    if mu <= 0 or c <= 0:
+        nan = np.full(lmbdas.shape, np.nan)
+        return {chave: nan.copy() for chave in ("rho", "L", "Lq", "W", "Wq", "P0")}
+
+    validos = (lmbdas > 0) & (lmbdas < c * mu)
+    lam = np.where(validos, lmbdas, np.nan)
+
+    rho = lam / (c * mu)
+    a = lam / mu
+
+    erlang_b = np.ones_like(a)
+    for n in range(1, c + 1):
+        erlang_b = a * erlang_b / (n + a * erlang_b)
+
+    log_termo = c * np.log(a) - math.lgamma(c + 1)
+    with np.errstate(divide="ignore"):
+        log_soma = np.where(erlang_b > 0, log_termo - np.log(erlang_b), a)
+
+    erlang_c = erlang_b / (1 - rho * (1 - erlang_b))
+    P0 = np.exp(-log_soma) / (1 - erlang_b + erlang_b / (1 - rho))
+
+    Lq = erlang_c * rho / (1 - rho)
+    L = Lq + a
+    Wq = Lq / lam
+    W = Wq + 1 / mu
+
+    return {
+        "rho": rho,
+        "L": L,
+        "Lq": Lq,
+        "W": W,
+        "Wq": Wq,
+        "P0": P0,
+    }
+
+
+def grade_lambda(mu: float, c: int, pontos: int):
+    """
+    Grade uniforme de λ cobrindo toda a região estável: λ_i = i·c·μ / pontos,
+    i = 0 .. pontos-1, ou seja, ρ de 0 até (pontos-1)/pontos.
+    Retorna (vetor de λ, passo).
+    """
+    passo = c * mu / pontos
+    return np.arange(pontos) * passo, passo
+
+
+def curva_metricas(model_type: str, lmbdas, mu: float, c: int = 1):
+    """
+    Métricas do modelo ("M/M/1" ou "M/M/c") para todo um vetor de λ,
+    usando as versões em lote. Usada para pré-calcular a curva W × λ.
+    """
+    if model_type == "M/M/1":
+        return mm1_metrics_batch(lmbdas, mu)
+    return mmc_metrics_batch(lmbdas, mu, c)
+
+
+# ----------------------------------------
+# Modelos com capacidade finita (K)
+# ----------------------------------------
+def mmck_metrics(lmbda: float, mu: float, c: int, K: int):
+    """
+    Calcula métricas do modelo M/M/c/K (c servidores, no máximo K clientes
+    no sistema). Chegadas que encontram o sistema cheio são bloqueadas, então
+    o sistema é sempre estável; as métricas usam a taxa efetiva λ·(1 - PK).
+    λ e μ em req/s.
+
+    As probabilidades p_n são calculadas em escala logarítmica e normalizadas
+    no final, o que permite c e K grandes.
+
+    Retorna dict (com PK = probabilidade de bloqueio) ou None se os
+    parâmetros forem inválidos (λ <= 0, μ <= 0, c < 1 ou K < c).
+    """
+    if lmbda <= 0 or mu <= 0 or c <= 0 or K < c:
+        return None
+
+    c = int(c)
+    K = int(K)
+    a = lmbda / mu  # tráfego oferecido
+
+    n = np.arange(K + 1)
+    log_fat = np.concatenate(([0.0], np.cumsum(np.log(np.arange(1, K + 1)))))  # log(n!)
+    log_p = np.where(
+        n <= c,
+        n * math.log(a) - log_fat,
+        c * math.log(a) - log_fat[c] + (n - c) * math.log(a / c),
+    )
+    p = np.exp(log_p - log_p.max())
+    p /= p.sum()
+
+    P0 = float(p[0])
+    PK = float(p[K])
+    L = float(np.dot(n, p))
+    Lq = float(np.dot(np.maximum(n - c, 0), p))
+
+    lmbda_ef = lmbda * (1 - PK)  # taxa efetiva de entrada
+    rho = lmbda_ef / (c * mu)
+    W = L / lmbda_ef
+    Wq = Lq / lmbda_ef
+
+    return {
+        "rho": rho,
+        "L": L,
+        "Lq": Lq,
+        "W": W,
+        "Wq": Wq,
+        "P0": P0,
+        "PK": PK,
+    }
+
+
+def mm1k_metrics(lmbda: float, mu: float, K: int):
+    """
+    Calcula métricas do modelo M/M/1/K (caso particular de M/M/c/K com c = 1).
+    """
+    return mmck_metrics(lmbda, mu, 1, K)
@@ -0,0 +1,129 @@
+import matplotlib.pyplot as plt
+
+
+# ----------------------------------------
+# Gráficos usados nas abas do site
+# ----------------------------------------
+def grafico_metricas(metricas: dict, model_type: str):
+    """
+    Gráfico de barras com as métricas de um único cenário.
+    """
+    fig, ax = plt.subplots(figsize=(8, 4))
+    ax.bar(list(metricas.keys()), list(metricas.values()))
+    ax.set_ylabel("Valor")
+    ax.set_title(f"Métricas do modelo {model_type}")
+    ax.tick_params(axis="x", labelrotation=45)
+    return fig
+
+
+def grafico_volume(datas, volumes):
+    """
+    Gráfico de linha do volume diário ao longo do tempo.
+    """
+    fig_vol, ax_vol = plt.subplots(figsize=(9, 3))
+    ax_vol.plot(datas, volumes)
+    ax_vol.set_xlabel("Data")
+    ax_vol.set_ylabel("Volume diário")
+    ax_vol.set_title("Volume diário ao longo do tempo")
+    ax_vol.tick_params(axis="x", labelrotation=30)
+    return fig_vol
+
+
+def grafico_comparativo(metricas_medio: dict, metricas_pico: dict):
+    """
+    Barras lado a lado comparando as métricas do dia médio e do dia de pico.
+    """
+    fig2, ax2 = plt.subplots(figsize=(9, 4))
+    indices = range(len(metricas_medio))
+    larg = 0.35
+
+    ax2.bar(
+        [i - larg/2 for i in indices],
+        list(metricas_medio.values()),
+        width=larg,
+        label="Dia Médio",
+    )
+    ax2.bar(
+        [i + larg/2 for i in indices],
+        list(metricas_pico.values()),
+        width=larg,
+        label="Dia de Pico",
+    )
+
+    ax2.set_xticks(list(indices))
+    ax2.set_xticklabels(list(metricas_medio.keys()))
+    ax2.set_ylabel("Valor")
+    ax2.set_title("Métricas – comparação Dia Médio x Dia de Pico")
+    ax2.legend()
+    return fig2
+
+
+def grafico_cenarios(df, eixo_x: str, metrica: str, max_series: int = 12):
+    """
+    Linhas da métrica escolhida em função de um parâmetro, com uma série para
+    cada combinação dos demais parâmetros que variam nos cenários filtrados.
+    """
+    rotulos = {"lmbda": "λ (req/s)", "mu": "μ (req/s)", "c": "c (servidores)", "K": "K (capacidade)"}
+    outros = [p for p in ("lmbda", "mu", "c", "K") if p != eixo_x and df[p].nunique() > 1]
+
+    fig, ax = plt.subplots(figsize=(9, 4))
+    grupos = df.groupby(outros, dropna=False) if outros else [((), df)]
+    for i, (valores, grupo) in enumerate(grupos):
+        if i == max_series:
+            break
+        if not isinstance(valores, tuple):
+            valores = (valores,)
+        grupo = grupo.sort_values(eixo_x)
+        rotulo = ", ".join(f"{p}={v:g}" for p, v in zip(outros, valores)) or metrica
+        ax.plot(grupo[eixo_x], grupo[metrica], marker="o", markersize=3, label=rotulo)
+
+    ax.set_xlabel(rotulos[eixo_x])
+    ax.set_ylabel(metrica)
+    ax.set_title(f"{metrica} em função de {rotulos[eixo_x]}")
+    if outros:
+        ax.legend(fontsize="small")
+    return fig
+
+
+def grafico_curva_w(lmbdas, W, pontos):
+    """
+    Curva W × λ (região estável) com pontos destacados; `pontos` é uma lista
+    de (rótulo, λ, W). Retorna uma especificação Vega-Lite (para
+    st.vega_lite_chart), desenhada no navegador: no modo interativo o servidor
+    só monta um dict com os dados, sem renderizar imagem matplotlib nem criar
+    objetos Altair (só a construção de um gráfico Altair custa ~30 ms).
+    """
+    curva = [
+        {"lambda": float(x), "W": float(y)}
+        for x, y in zip(lmbdas, W)
+        if x > 0 and y == y  # y == y descarta NaN (instável)
+    ]
+    marcas = [{"ponto": rotulo, "lambda": float(x), "W": float(y)} for rotulo, x, y in pontos]
+
+    eixo_x = {"field": "lambda", "type": "quantitative", "title": "λ (req/s)"}
+    eixo_y = {"field": "W", "type": "quantitative", "title": "W (s)", "scale": {"type": "log"}}
+    return {
+        "title": "Tempo médio no sistema W em função de λ",
+        "height": 300,
+        "layer": [
+            {
+                "data": {"values": curva},
+                "mark": "line",
+                "encoding": {"x": eixo_x, "y": eixo_y},
+            },
+            {
+                "data": {"values": marcas},
+                "mark": {"type": "point", "size": 120, "filled": True},
+                "encoding": {
+                    "x": eixo_x,
+                    "y": eixo_y,
+                    "color": {"field": "ponto", "type": "nominal", "title": None},
+                    "tooltip": [
+                        {"field": "ponto", "type": "nominal"},
+                        eixo_x,
+                        {"field": "W", "type": "quantitative", "title": "W (s)"},
+                    ],
+                },
+            },
+        ],
+    }
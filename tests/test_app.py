@@ -0,0 +1,87 @@
+import os
+
+import pytest
+import streamlit
+from streamlit.proto.Common_pb2 import FileURLs
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from streamlit.runtime.uploaded_file_manager import UploadedFile, UploadedFileRec
+from streamlit.testing.v1 import AppTest
+
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(RAIZ, "app.py")
+
+CSV = b"date,volume_24h_total\n2024-01-01,86400\n2024-01-02,\n2024-01-03,259200\n"
+
+
+@pytest.fixture
+def app():
+    return AppTest.from_file(APP, default_timeout=30)
+
+
+def test_upload_guarda_so_a_referencia(app, monkeypatch):
+    envios = []
+    original = streamlit.file_uploader
+
+    def file_uploader(rotulo, **kwargs):
+        original(rotulo, **kwargs)
+        if kwargs["key"] != "arquivo_csv_0":
+            return None
+        # simula o envio: os bytes ficam no gerenciador de uploads da sessão
+        ctx = get_script_run_ctx()
+        registro = UploadedFileRec("envio-1", "volume.csv", "text/csv", CSV)
+        ctx.uploaded_file_mgr.add_file(ctx.session_id, registro)
+        envios.append((ctx.uploaded_file_mgr, ctx.session_id))
+        return UploadedFile(registro, FileURLs())
+
+    monkeypatch.setattr(streamlit, "file_uploader", file_uploader)
+    app.run()
+
+    assert not app.exception
+    gerenciador, sessao = envios[0]
+    assert gerenciador.get_files(sessao, ["envio-1"]) == []
+    assert app.session_state["numero_envio_csv"] == 1
+    nome, referencia = app.session_state["dataset_compartilhado"]
+    assert nome == "volume.csv"
+    assert referencia.tabela.num_rows == 3
+    assert any("λ pico" in m.value for m in app.markdown)
+
+    [descartar] = [b for b in app.button if b.label == "Descartar dataset"]
+    descartar.click().run()
+    assert "dataset_compartilhado" not in app.session_state
+
+
+def _slider(app, rotulo):
+    [slider] = [s for s in app.slider if s.label == rotulo]
+    return slider
+
+
+def test_slider_de_lambda_aceita_movimentos_seguidos(app):
+    app.run()
+    [modo] = [t for t in app.toggle if t.label.startswith("Modo interativo")]
+    modo.set_value(True).run()
+
+    for lmbda in (10.0, 20.0, 40.0, 45.0, 12.0):
+        _slider(app, "Taxa de chegada λ (req/s)").set_value(lmbda).run()
+
+        assert not app.exception
+        assert _slider(app, "Taxa de chegada λ (req/s)").value == pytest.approx(lmbda)
+        [rho] = [m for m in app.metric if m.label == "Utilização ρ"]
+        assert float(rho.value) == pytest.approx(lmbda / 50.0, abs=1e-3)
+
+
+def test_slider_de_lambda_mantem_rho_quando_mu_muda(app):
+    app.run()
+    [modo] = [t for t in app.toggle if t.label.startswith("Modo interativo")]
+    modo.set_value(True).run()
+
+    _slider(app, "Taxa de chegada λ (req/s)").set_value(40.0).run()
+    _slider(app, "Taxa de serviço μ (req/s) por servidor").set_value(100.0).run()
+
+    assert _slider(app, "Taxa de chegada λ (req/s)").value == pytest.approx(80.0)
+
+    # de volta a uma grade já visitada, λ parte da ρ atual e não do valor antigo
+    _slider(app, "Taxa de chegada λ (req/s)").set_value(20.0).run()
+    _slider(app, "Taxa de serviço μ (req/s) por servidor").set_value(50.0).run()
+
+    assert _slider(app, "Taxa de chegada λ (req/s)").value == pytest.approx(10.0)
@@ -0,0 +1,65 @@
+import gc
+import io
+import os
+
+from armazem import ArmazemDatasets
+
+
+CSV = b"date,volume_24h_total\n2024-01-01,10\n2024-01-02,\n2024-01-03,30\n"
+
+
+def test_mesmo_conteudo_compartilha_tabela_e_derivados(tmp_path):
+    armazem = ArmazemDatasets(str(tmp_path))
+    r1 = armazem.adquirir(io.BytesIO(CSV))
+    r2 = armazem.adquirir(io.BytesIO(CSV))
+
+    assert r1.tabela is r2.tabela
+    assert armazem.referencias(r1.chave) == 2
+    assert armazem.resumo_volume(r1, "volume_24h_total") == (20.0, 30.0)
+
+    serie1, datas_ok = armazem.serie_volume(r1, "date", "volume_24h_total")
+    serie2, _ = armazem.serie_volume(r2, "date", "volume_24h_total")
+    assert datas_ok
+    assert serie1 is serie2
+    assert len(serie1) == 2
+
+
+def test_referencia_liberada_sai_do_registro(tmp_path):
+    armazem = ArmazemDatasets(str(tmp_path))
+    r1 = armazem.adquirir(io.BytesIO(CSV))
+    r2 = armazem.adquirir(io.BytesIO(CSV))
+    chave = r1.chave
+
+    r1.liberar()
+    r1.liberar()  # idempotente
+    assert armazem.referencias(chave) == 1
+
+    del r2
+    gc.collect()
+    assert armazem.referencias(chave) == 0
+
+
+def test_limite_de_disco_apaga_apenas_arquivos_sem_uso(tmp_path):
+    armazem = ArmazemDatasets(str(tmp_path), limite_disco=1)
+    em_uso = armazem.adquirir(io.BytesIO(CSV))
+    outra = armazem.adquirir(io.BytesIO(CSV + b"2024-01-04,40\n"))
+    assert len(os.listdir(tmp_path)) == 2
+
+    outra.liberar()
+    assert os.listdir(tmp_path) == [f"{em_uso.chave}.arrow"]
+
+    em_uso.liberar()
+    assert os.listdir(tmp_path) == []
+
+
+def test_finalizador_nao_pega_a_trava_do_armazem(tmp_path):
+    armazem = ArmazemDatasets(str(tmp_path))
+    referencia = armazem.adquirir(io.BytesIO(CSV))
+    chave = referencia.chave
+
+    # simula a coleta da sessão numa thread que já está dentro do armazém
+    with armazem._trava:
+        del referencia
+        gc.collect()
+
+    assert armazem.referencias(chave) == 0
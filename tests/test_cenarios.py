@@ -0,0 +1,69 @@
+import json
+import os
+import sqlite3
+
+import pytest
+
+from cenarios import carregar_cenarios, chave_cenario, executar, hash_entrada
+
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXEMPLO = os.path.join(RAIZ, "cenarios_exemplo.json")
+
+
+def test_exemplo_expande_todas_as_combinacoes():
+    cenarios = carregar_cenarios(EXEMPLO)
+
+    por_modelo = {}
+    for cenario in cenarios:
+        por_modelo.setdefault(cenario["modelo"], []).append(cenario)
+
+    # grade 1: λ de 5 a 95 (19 valores) × μ (2); M/M/1 ignora K, M/M/1/K usa 3 valores
+    assert len(por_modelo["M/M/1"]) == 19 * 2
+    assert len(por_modelo["M/M/1/K"]) == 19 * 2 * 3
+    # grade 2: λ de 10 a 400 (40 valores) × μ (2) × c de 1 a 16; M/M/c/K usa 2 valores de K
+    assert len(por_modelo["M/M/c"]) == 40 * 2 * 16
+    assert len(por_modelo["M/M/c/K"]) == 40 * 2 * 16 * 2
+    assert len(cenarios) == 38 + 114 + 1280 + 2560
+
+    assert {c["lmbda"] for c in por_modelo["M/M/1"]} == {float(v) for v in range(5, 100, 5)}
+    assert {c["lmbda"] for c in por_modelo["M/M/c"]} == {float(v) for v in range(10, 410, 10)}
+
+
+def test_lambda_de_dataset_fica_fora_da_chave(tmp_path):
+    csv = tmp_path / "volume.csv"
+    csv.write_text("date,volume_24h_total\n2024-01-01,86400\n2024-01-02,172800\n")
+    especificacao = tmp_path / "cenarios.json"
+    especificacao.write_text(json.dumps({
+        "datasets": {"cmc": "volume.csv"},
+        "grades": [{"modelo": "M/M/1", "lambda": {"dataset": "cmc", "estatistica": "pico"}, "mu": 10}],
+    }))
+
+    [antes] = carregar_cenarios(str(especificacao))
+    assert antes["lmbda"] == pytest.approx(2.0)
+
+    csv.write_text("date,volume_24h_total\n2024-01-01,86400\n2024-01-02,259200\n")
+    [depois] = carregar_cenarios(str(especificacao))
+
+    assert chave_cenario(antes) == chave_cenario(depois)
+    assert hash_entrada(antes) != hash_entrada(depois)
+
+
+def test_executar_grava_cada_lambda_e_reaproveita(tmp_path):
+    banco = str(tmp_path / "cenarios.db")
+    cenarios = carregar_cenarios(EXEMPLO)
+
+    assert executar(cenarios, banco, processos=1) == (len(cenarios), 0)
+    assert executar(cenarios, banco, processos=1) == (0, len(cenarios))
+
+    conexao = sqlite3.connect(banco)
+    try:
+        total, = conexao.execute("SELECT COUNT(*) FROM cenarios").fetchone()
+        lambdas_mm1 = conexao.execute(
+            "SELECT COUNT(DISTINCT lmbda) FROM cenarios WHERE modelo = 'M/M/1'"
+        ).fetchone()[0]
+    finally:
+        conexao.close()
+
+    assert total == len(cenarios)
+    assert lambdas_mm1 == 19
@@ -0,0 +1,148 @@
+import math
+import warnings
+
+import numpy as np
+import pytest
+
+from filas import (
+    mm1_metrics,
+    mm1_metrics_batch,
+    mm1k_metrics,
+    mmc_metrics,
+    mmc_metrics_batch,
+    mmck_metrics,
+)
+
+
+METRICAS_MMC = ("rho", "L", "Lq", "W", "Wq", "P0")
+
+
+def _mmc_fatorial(lmbda, mu, c):
+    """
+    Fórmula original (somatório com a**n / n!), válida para c pequeno.
+    """
+    rho = lmbda / (c * mu)
+    a = lmbda / mu
+    soma = sum(a ** n / math.factorial(n) for n in range(c))
+    P0 = 1.0 / (soma + a ** c / (math.factorial(c) * (1 - rho)))
+    Lq = P0 * a ** c * rho / (math.factorial(c) * (1 - rho) ** 2)
+    return {"rho": rho, "L": Lq + a, "Lq": Lq, "W": Lq / lmbda + 1 / mu, "Wq": Lq / lmbda, "P0": P0}
+
+
+@pytest.mark.parametrize("c", [1, 2, 5, 10, 50, 120])
+@pytest.mark.parametrize("rho", [0.05, 0.5, 0.9, 0.99])
+def test_mmc_igual_a_formula_fatorial(c, rho):
+    mu = 50.0
+    lmbda = rho * c * mu
+    resultados = mmc_metrics(lmbda, mu, c)
+    esperado = _mmc_fatorial(lmbda, mu, c)
+
+    for metrica in METRICAS_MMC:
+        assert resultados[metrica] == pytest.approx(esperado[metrica], rel=1e-9)
+
+
+def test_mmc_com_um_servidor_igual_a_mm1():
+    mm1 = mm1_metrics(30.0, 50.0)
+    mmc = mmc_metrics(30.0, 50.0, 1)
+    for metrica in mm1:
+        assert mmc[metrica] == pytest.approx(mm1[metrica], rel=1e-12)
+
+
+@pytest.mark.parametrize("c", [1, 7, 100, 10000])
+def test_lote_igual_ao_escalar(c):
+    mu = 50.0
+    lambdas = np.linspace(0, c * mu, 41)[1:-1]
+    lote = mmc_metrics_batch(lambdas, mu, c)
+
+    for i, lmbda in enumerate(lambdas):
+        escalar = mmc_metrics(float(lmbda), mu, c)
+        for metrica in METRICAS_MMC:
+            assert lote[metrica][i] == pytest.approx(escalar[metrica], rel=1e-9)
+
+    lote_mm1 = mm1_metrics_batch(lambdas[:5] / c, mu)
+    for i, lmbda in enumerate(lambdas[:5] / c):
+        for metrica, valor in mm1_metrics(float(lmbda), mu).items():
+            assert lote_mm1[metrica][i] == pytest.approx(valor, rel=1e-12)
+
+
+def test_lote_instavel_ou_invalido_vira_nan():
+    lambdas = np.array([-1.0, 0.0, 30.0, 100.0, 150.0])
+
+    lote = mmc_metrics_batch(lambdas, 50.0, 2)
+    assert np.isnan(lote["W"]).tolist() == [True, True, False, True, True]
+    assert mmc_metrics(100.0, 50.0, 2) is None
+    assert mmc_metrics(0.0, 50.0, 2) is None
+
+    lote_mm1 = mm1_metrics_batch(lambdas, 50.0)
+    assert np.isnan(lote_mm1["W"]).tolist() == [True, True, False, True, True]
+
+    for mu, c in ((0.0, 2), (50.0, 0)):
+        for valores in mmc_metrics_batch(lambdas, mu, c).values():
+            assert np.isnan(valores).all()
+        assert mmc_metrics(30.0, mu, c) is None
+
+
+def test_mmc_com_dez_mil_servidores_nao_estoura():
+    mu = 50.0
+    c = 10 ** 4
+    lambdas = np.array([0.5, 0.9, 0.999]) * c * mu
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        lote = mmc_metrics_batch(lambdas, mu, c)
+        escalares = [mmc_metrics(float(lmbda), mu, c) for lmbda in lambdas]
+
+    for i, resultados in enumerate(escalares):
+        for metrica in METRICAS_MMC:
+            assert math.isfinite(resultados[metrica])
+            assert np.isfinite(lote[metrica][i])
+        assert resultados["Lq"] >= 0
+        assert resultados["W"] >= 1 / mu
+
+    # com ρ = 0,5 e 10^4 servidores praticamente ninguém espera
+    assert escalares[0]["Lq"] == pytest.approx(0.0, abs=1e-12)
+    # perto da saturação a fila aparece
+    assert escalares[2]["Lq"] > escalares[1]["Lq"] > 0
+
+
+def _mm1k_fechada(lmbda, mu, K):
+    """
+    Fórmulas fechadas do M/M/1/K.
+    """
+    rho = lmbda / mu
+    if rho == 1:
+        P0 = 1 / (K + 1)
+        L = K / 2
+    else:
+        P0 = (1 - rho) / (1 - rho ** (K + 1))
+        L = rho / (1 - rho) - (K + 1) * rho ** (K + 1) / (1 - rho ** (K + 1))
+    PK = P0 * rho ** K
+    lmbda_ef = lmbda * (1 - PK)
+    Lq = L - (1 - P0)
+    return {"rho": lmbda_ef / mu, "L": L, "Lq": Lq, "W": L / lmbda_ef, "Wq": Lq / lmbda_ef, "P0": P0, "PK": PK}
+
+
+@pytest.mark.parametrize("K", [1, 5, 50])
+@pytest.mark.parametrize("lmbda", [10.0, 50.0, 80.0, 200.0])
+def test_mm1k_igual_a_formula_fechada(lmbda, K):
+    resultados = mm1k_metrics(lmbda, 50.0, K)
+    esperado = _mm1k_fechada(lmbda, 50.0, K)
+
+    for metrica, valor in esperado.items():
+        assert resultados[metrica] == pytest.approx(valor, rel=1e-9, abs=1e-15)
+
+
+def test_mmck_com_k_grande_tende_a_mmc():
+    mmc = mmc_metrics(90.0, 50.0, 2)
+    mmck = mmck_metrics(90.0, 50.0, 2, 2000)
+
+    assert mmck["PK"] < 1e-12
+    for metrica in METRICAS_MMC:
+        assert mmck[metrica] == pytest.approx(mmc[metrica], rel=1e-9)
+
+
+def test_mmck_parametros_invalidos():
+    assert mmck_metrics(0.0, 50.0, 2, 10) is None
+    assert mmck_metrics(30.0, 0.0, 2, 10) is None
+    assert mmck_metrics(30.0, 50.0, 0, 10) is None
+    assert mmck_metrics(30.0, 50.0, 4, 3) is None